@@ -0,0 +1,69 @@
+# compare the time taken to build dashed arrows, depending on their number
+"""
+random straight arrows are built with:
+- DashedVMobject: new_geometry.DashedArrow(analytic=False), the dashes being sampled on the curve by manim
+- analytic: new_geometry.DashedArrow, the dashes of a straight arrow being placed directly
+- field: a single DashedArrowField holding all the arrows
+the best time of the repetitions is reported, along with the largest distance between the points of the dashes
+built by DashedVMobject and by the analytic placement
+"""
+import argparse
+import time
+
+import numpy as np
+
+from new_geometry import DashedArrow, DashedArrowField
+
+dash_config = dict(dashed_ratio=0.4, dash_length=0.15)
+
+
+def build_arrows(starts, ends, analytic):
+    return [DashedArrow(start=start, end=end, analytic=analytic, **dash_config) for start, end in zip(starts, ends)]
+
+
+methods = {
+    "DashedVMobject": lambda starts, ends: build_arrows(starts, ends, False),
+    "analytic": lambda starts, ends: build_arrows(starts, ends, True),
+    "field": lambda starts, ends: DashedArrowField(starts, ends, **dash_config),
+}
+
+
+def best_time(function, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def dash_points(arrow):
+    return np.concatenate([m.points for m in arrow.submobjects if m is not arrow.tip])
+
+
+def max_error(starts, ends):
+    # largest distance between the dashes of both implementations
+    sampled = build_arrows(starts, ends, False)
+    analytic = build_arrows(starts, ends, True)
+    return max(np.abs(dash_points(a) - dash_points(b)).max() for a, b in zip(sampled, analytic))
+
+
+def random_arrows(rng, count):
+    corner = np.array([7, 4, 0])
+    return rng.uniform(-corner, corner, (count, 3)), rng.uniform(-corner, corner, (count, 3))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="benchmark the construction of dashed arrows")
+    parser.add_argument("-n", "--counts", default="10,100,1000", help="numbers of arrows built (10,100,1000 by default)")
+    parser.add_argument("-r", "--repeat", type=int, default=3, help="number of repetitions of each measure")
+    parser.add_argument("-s", "--seed", type=int, default=0, help="seed of the random arrows")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'arrows':>8}" + "".join(f"{name:>16}" for name in methods) + f"{'max error':>12}")
+    for count in [int(c) for c in args.counts.split(",")]:
+        starts, ends = random_arrows(rng, count)
+        times = [best_time(lambda: method(starts, ends), args.repeat) for method in methods.values()]
+        print(f"{count:>8}" + "".join(f"{t * 1000:>14.1f}ms" for t in times)
+              + f"{max_error(starts[:10], ends[:10]):>12.2e}")
@@ -0,0 +1,99 @@
+# check the scaling of the operations of the sequence variable against the complexities shown in the slides
+"""
+each operation of sequence_var.SequenceVar is timed on variables of growing size n, with few members and about n
+possible nodes, such that |P| grows as n while |S| stays constant
+the operations changing the variable are each done between save_state and restore_state, such that every call
+starts from the same variable, and only the call itself is timed
+the time of an operation is the median of many samples, and the check compares the ratio t(n_max) / t(n_min) to
+the one of the complexity given in the table of DomainConsistency: it fails when the ratio exceeds
+(n_max / n_min) ** exponent times the slack, the exponent being 0 for a constant time and 1 for a time linear in |P|
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from sequence_var import SequenceVar
+
+num_members = 10
+repeat = 200
+
+
+def setup(n):
+    # variable with num_members members and all the other nodes possible
+    sequence = SequenceVar(n)
+    for node in range(1, num_members - 1):
+        sequence.insert(node - 1, node)
+    return sequence
+
+
+def possible_nodes(sequence, count):
+    return sequence.get_possible()[:count].tolist()
+
+
+# operation: (complexity in the table, its exponent in n, changes the variable, function of the variable and a node)
+operations = {
+    "is_bound": ("1", 0, False, lambda s, x: s.is_bound()),
+    "is_member": ("1", 0, False, lambda s, x: s.is_member(x)),
+    "succ": ("1", 0, False, lambda s, x: s.succ(0)),
+    "pred": ("1", 0, False, lambda s, x: s.pred(s.last)),
+    "n_member_inserts": ("1", 0, False, lambda s, x: s.n_member_inserts(x)),
+    "n_possible_inserts": ("1", 0, False, lambda s, x: s.n_possible_inserts(x)),
+    "can_insert": ("1", 0, False, lambda s, x: s.can_insert(0, x)),
+    "get_member_inserts": ("min(|I^x|, |S|)", 0, False, lambda s, x: s.get_member_inserts(x)),
+    "get_possible": ("|P|", 1, False, lambda s, x: s.get_possible()),
+    "insert": ("|P|", 1, True, lambda s, x: s.insert(0, x)),
+    "exclude": ("|P|", 1, True, lambda s, x: s.exclude(x)),
+    "remove_insert": ("|P|", 1, True, lambda s, x: s.remove_insert(0, x)),
+}
+
+
+def time_operation(function, changes, n, samples=31, passes=20):
+    # time of one operation on a variable of n nodes, the median of the samples
+    # the operations which do not change the variable are repeated passes times on each node, to be measurable
+    sequence = setup(n)
+    nodes = possible_nodes(sequence, repeat)
+    times = []
+    for _ in range(samples):
+        if changes:
+            total = 0
+            for node in nodes:
+                sequence.save_state()
+                start = time.perf_counter()
+                function(sequence, node)
+                total += time.perf_counter() - start
+                sequence.restore_state()
+            times.append(total / len(nodes))
+        else:
+            start = time.perf_counter()
+            for node in nodes * passes:
+                function(sequence, node)
+            times.append((time.perf_counter() - start) / (len(nodes) * passes))
+    return np.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="check the complexities of the operations of the sequence variable")
+    parser.add_argument("-n", "--sizes", default="250,500,1000,2000",
+                        help="numbers of nodes of the variables (250,500,1000,2000 by default)")
+    parser.add_argument("-s", "--slack", type=float, default=2,
+                        help="factor allowed on the ratio of the complexity between the largest and smallest sizes "
+                             "(2 by default)")
+    args = parser.parse_args()
+
+    sizes = [int(n) for n in args.sizes.split(",")]
+    growth = max(sizes) / min(sizes)
+    print(f"{'operation':<22}" + "".join(f"{n:>10}" for n in sizes) + f"{'ratio':>8}{'bound':>8}  table")
+    failed = []
+    for name, (table, complexity, changes, function) in operations.items():
+        times = {n: time_operation(function, changes, n) for n in sizes}
+        ratio = times[max(sizes)] / times[min(sizes)]
+        bound = growth ** complexity * args.slack
+        print(f"{name:<22}" + "".join(f"{times[n] * 1e6:>8.2f}us" for n in sizes) + f"{ratio:>8.2f}{bound:>8.1f}  "
+              f"{table}")
+        if ratio > bound:
+            failed.append(name)
+    if failed:
+        print(f"slower than the table of the slides: {', '.join(failed)}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,166 @@
+# benchmark the rendering of each slide and detect the slides becoming slower
+"""
+each slide is rendered at a small fixed resolution in its own process, recording its wall time, cpu time,
+peak memory, number of frames and size of the movie files written
+every run is appended to history_file, and compared against baseline_file: the benchmark fails when a slide
+takes more than (1 + threshold) times its baseline for one of the compared metrics
+"""
+import argparse
+import datetime
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from merge_slide import select_slides, slide_names, to_merge
+
+history_file = "bench_history.jsonl"
+baseline_file = "bench_baseline.json"
+resolution = (320, 180)
+frame_rate = 15
+metrics = ["wall", "cpu", "peak_rss", "frames", "bytes"]
+
+
+def _usage():
+    # cpu time and peak memory in bytes of the process and of the processes it waited for (ffmpeg, ...)
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    unit = 1 if sys.platform == "darwin" else 1024
+    return dict(cpu=own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime,
+                peak_rss=max(own.ru_maxrss, children.ru_maxrss) * unit)
+
+
+def render_child(name, output):
+    # executed in the child process: render one slide and write its frames, bytes written and usage to output
+    from manim import Scene, config
+    from manim.scene.scene_file_writer import SceneFileWriter
+
+    from dry_run import load_slides
+
+    config.pixel_width, config.pixel_height = resolution
+    config.frame_rate = frame_rate
+    config.disable_caching = True
+    config.progress_bar = "none"
+    config.verbosity = "WARNING"
+    # the movies are written next to the output, in the folder removed by the parent
+    config.media_dir = os.path.join(os.path.dirname(output), "media")
+    frames = 0
+    write_frame = SceneFileWriter.write_frame
+
+    def counted_write_frame(self, *args, **kwargs):
+        nonlocal frames
+        frames += 1
+        return write_frame(self, *args, **kwargs)
+
+    SceneFileWriter.write_frame = counted_write_frame
+    scene = getattr(load_slides(), name)()
+    # the files are not copied to the presentation folder
+    Scene.render(scene)
+    written = sum(os.path.getsize(f) for f in scene.renderer.file_writer.partial_movie_files
+                  if f is not None and os.path.isfile(f))
+    with open(output, "w") as file:
+        json.dump(dict(frames=frames, bytes=written, **_usage()), file)
+
+
+def bench_slide(name):
+    # metrics of one slide, measured on a separate process
+    with tempfile.TemporaryDirectory(prefix="bench_") as folder:
+        output = os.path.join(folder, "result.json")
+        with open(os.path.join(folder, "log.txt"), "w+") as log:
+            start = time.perf_counter()
+            process = subprocess.Popen([sys.executable, __file__, "--child", name, "--output", output],
+                                       stdout=log, stderr=subprocess.STDOUT)
+            process.wait()
+            wall = time.perf_counter() - start
+            if process.returncode != 0:
+                log.seek(0)
+                raise RuntimeError(f"benchmark of {name} failed with exit code {process.returncode}\n{log.read()}")
+        # cpu time and peak memory are measured by the child itself
+        with open(output) as file:
+            result = json.load(file)
+    return dict(wall=wall, **result)
+
+
+def bench_slides(names, repeat=1):
+    # the fastest of the repetitions is kept, to reduce the noise
+    results = {}
+    for name in names:
+        runs = [bench_slide(name) for _ in range(repeat)]
+        results[name] = {metric: min(run[metric] for run in runs) for metric in metrics}
+        print(f"{name:<20}{results[name]['wall']:>8.2f}s{results[name]['cpu']:>8.2f}s"
+              f"{results[name]['peak_rss'] / 2 ** 20:>8.0f}MB{results[name]['frames']:>7} frames"
+              f"{results[name]['bytes'] / 2 ** 10:>8.0f}kB")
+    return results
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def append_history(results):
+    record = dict(date=datetime.datetime.now().isoformat(timespec="seconds"), commit=_commit(),
+                  resolution=resolution, frame_rate=frame_rate, slides=results)
+    with open(history_file, "a") as file:
+        file.write(json.dumps(record) + "\n")
+
+
+def regressions(results, baseline, threshold, compared):
+    # (slide, metric, baseline value, current value) of each regression
+    found = []
+    for name, values in results.items():
+        for metric in compared:
+            if name in baseline and values[metric] > baseline[name][metric] * (1 + threshold):
+                found.append((name, metric, baseline[name][metric], values[metric]))
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"benchmark the rendering of the slides from {to_merge}")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to benchmark, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("-t", "--threshold", type=float, default=0.2,
+                        help="relative slowdown allowed against the baseline (0.2 by default)")
+    parser.add_argument("-m", "--metrics", default="wall,cpu", help=f"metrics compared, among {','.join(metrics)}")
+    parser.add_argument("-r", "--repeat", type=int, default=1, help="number of renderings of each slide")
+    parser.add_argument("--update-baseline", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--output", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        render_child(args.child, args.output)
+        sys.exit(0)
+
+    names = slide_names()
+    if args.slides is not None:
+        names = select_slides(names, args.slides)
+    try:
+        results = bench_slides(names, args.repeat)
+    except RuntimeError as error:
+        # a slide which cannot be rendered fails the run, without recording it
+        print(error, file=sys.stderr)
+        sys.exit(1)
+    append_history(results)
+
+    baseline = {}
+    if os.path.isfile(baseline_file):
+        with open(baseline_file) as file:
+            baseline = json.load(file)
+    if args.update_baseline or not baseline:
+        with open(baseline_file, "w") as file:
+            json.dump({**baseline, **results}, file, indent=2)
+        print(f"baseline stored in {baseline_file}")
+        sys.exit(0)
+
+    found = regressions(results, baseline, args.threshold, args.metrics.split(","))
+    for name, metric, before, after in found:
+        print(f"regression of {name}: {metric} {before:.2f} -> {after:.2f} (+{100 * (after / before - 1):.0f}%)",
+              file=sys.stderr)
+    if found:
+        sys.exit(1)
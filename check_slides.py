@@ -0,0 +1,189 @@
+# check the slides before rendering them, without drawing nor encoding any frame
+"""
+all failures are reported at once:
+- every construct() must end with a self.pause()\nself.wait() instruction (needed by merge_slide.py)
+- every file given to ImageMobject, SVGMobject or open must exist
+- every Tex, MathTex, BulletedList and MathTable built from literal strings must compile with LaTeX
+strings that are not literals (f-strings, variables) cannot be checked statically and are skipped
+"""
+import argparse
+import ast
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from merge_slide import is_self_call, is_slide, select_slides, to_merge
+
+tex_classes = ["Tex", "MathTex", "BulletedList"]
+table_classes = {"MathTable": "MathTex"}  # class of each entry of the table
+factory_classes = {"cached_tex": "Tex", "cached_math_tex": "MathTex"}  # class built by each factory of utils.py
+tex_kwargs = ["tex_environment", "arg_separator", "tex_template"]
+file_classes = ["ImageMobject", "SVGMobject", "open"]
+NOT_LITERAL = object()
+
+
+def _call_name(node):
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        return node.func.id
+    return None
+
+
+def _literal(node):
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError):
+        return NOT_LITERAL
+
+
+def check_construct(name, node):
+    construct = [n for n in node.body if isinstance(n, ast.FunctionDef) and n.name == "construct"]
+    if not construct:
+        return [(name, node.lineno, "no construct()")]
+    body = construct[0].body
+    if len(body) < 2 or not is_self_call(body[-2], "pause") or not is_self_call(body[-1], "wait"):
+        return [(name, body[-1].lineno, "construct() must end with self.pause() and self.wait()")]
+    return []
+
+
+def check_files(name, node, folder):
+    failures = []
+    for call in ast.walk(node):
+        if _call_name(call) in file_classes and call.args:
+            path = _literal(call.args[0])
+            if isinstance(path, str) and not os.path.isfile(os.path.join(folder, path)):
+                failures.append((name, call.lineno, f"missing file {path}"))
+    return failures
+
+
+def _templates(function):
+    """
+    recipe of each TexTemplate created with literal arguments within a function:
+    the arguments of its constructor and the methods called on it, such as add_to_preamble
+    """
+    templates = {}
+    for statement in ast.walk(function):
+        if isinstance(statement, ast.Assign) and _call_name(statement.value) == "TexTemplate" \
+                and len(statement.targets) == 1 and isinstance(statement.targets[0], ast.Name):
+            call = statement.value
+            args = [_literal(a) for a in call.args]
+            kwargs = {k.arg: _literal(k.value) for k in call.keywords}
+            if NOT_LITERAL not in args + list(kwargs.values()):
+                templates[statement.targets[0].id] = (tuple(args), tuple(sorted(kwargs.items())), [])
+    for statement in ast.walk(function):
+        if isinstance(statement, ast.Call) and isinstance(statement.func, ast.Attribute) \
+                and isinstance(statement.func.value, ast.Name) and statement.func.value.id in templates:
+            args = [_literal(a) for a in statement.args]
+            if NOT_LITERAL not in args:
+                templates[statement.func.value.id][2].append((statement.func.attr, tuple(args)))
+    return {k: (args, kwargs, tuple(calls)) for k, (args, kwargs, calls) in templates.items()}
+
+
+def tex_jobs(name, node):
+    # (slide, line, class, strings, keyword arguments) of each Tex built from literal strings
+    jobs = []
+    for function in [n for n in ast.walk(node) if isinstance(n, ast.FunctionDef)]:
+        templates = _templates(function)
+        for call in ast.walk(function):
+            cls = factory_classes.get(_call_name(call), _call_name(call))
+            if cls not in tex_classes and cls not in table_classes:
+                continue
+            kwargs = {}
+            for keyword in call.keywords:
+                if keyword.arg == "tex_template":
+                    if not isinstance(keyword.value, ast.Name) or keyword.value.id not in templates:
+                        break
+                    kwargs["tex_template"] = templates[keyword.value.id]
+                elif keyword.arg in tex_kwargs:
+                    kwargs[keyword.arg] = _literal(keyword.value)
+            else:
+                args = [_literal(a) for a in call.args]
+                if NOT_LITERAL in args or NOT_LITERAL in kwargs.values():
+                    continue
+                if cls in table_classes:
+                    jobs += [(name, call.lineno, table_classes[cls], (entry,), ())
+                             for row in args[0] for entry in row if isinstance(entry, str)]
+                else:
+                    jobs.append((name, call.lineno, cls, tuple(args), tuple(sorted(kwargs.items()))))
+    return jobs
+
+
+def _latex_error(exception):
+    # first error reported in the LaTeX log, the message of the exception otherwise
+    message = str(exception)
+    log_file = re.search(r"(\S+\.log)", message)
+    if log_file is not None and os.path.isfile(log_file.group(1)):
+        with open(log_file.group(1)) as file:
+            errors = [line.strip() for line in file if line.startswith("!")]
+        if errors:
+            return errors[0]
+    return message.splitlines()[0] if message else type(exception).__name__
+
+
+def check_tex(jobs, workers=None):
+    import manim
+
+    # the Tex folder is shared between the threads: nothing must be deleted while compiling
+    manim.config.no_latex_cleanup = True
+
+    def compile_tex(job):
+        name, line, cls, args, kwargs = job
+        kwargs = dict(kwargs)
+        if "tex_template" in kwargs:
+            template_args, template_kwargs, calls = kwargs["tex_template"]
+            template = manim.TexTemplate(*template_args, **dict(template_kwargs))
+            for method, method_args in calls:
+                getattr(template, method)(*method_args)
+            kwargs["tex_template"] = template
+        try:
+            getattr(manim, cls)(*args, **kwargs)
+        except Exception as exception:
+            return [(name, line, f"{cls}{args}: {_latex_error(exception)}")]
+        return []
+
+    # the same string is compiled once, the failure is reported for each of its uses
+    unique = {}
+    for job in jobs:
+        unique.setdefault(job[2:], []).append(job)
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        results = list(pool.map(compile_tex, [uses[0] for uses in unique.values()]))
+    failures = []
+    for uses, result in zip(unique.values(), results):
+        for name, line, _, _, _ in uses:
+            failures += [(name, line, message) for _, _, message in result]
+    return failures
+
+
+def check_slides(file_name=to_merge, spec=None, tex=True, workers=None):
+    # list of (slide, line, message) for each failure
+    folder = os.path.dirname(os.path.abspath(file_name))
+    with open(file_name) as file:
+        slides = [node for node in ast.parse(file.read()).body if is_slide(node)]
+    if spec is not None:
+        selected = select_slides([node.name for node in slides], spec)
+        slides = [node for node in slides if node.name in selected]
+    failures = []
+    jobs = []
+    for node in slides:
+        failures += check_construct(node.name, node) + check_files(node.name, node, folder)
+        jobs += tex_jobs(node.name, node)
+    if tex:
+        failures += check_tex(jobs, workers)
+    return failures
+
+
+def report(failures, file_name=to_merge):
+    for name, line, message in failures:
+        print(f"{file_name}:{line}: [{name}] {message}", file=sys.stderr)
+    return not failures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"check the slides from {to_merge} before rendering them")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to check, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("--no-tex", action="store_true", help="do not compile the Tex strings")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of Tex strings compiled at once")
+    args = parser.parse_args()
+    if not report(check_slides(spec=args.slides, tex=not args.no_tex, workers=args.jobs)):
+        sys.exit(1)
@@ -0,0 +1,145 @@
+# execute the construct() of the slides without drawing nor encoding any frame
+"""
+every mobject is built and every animation is played up to its end against a renderer that does nothing,
+which validates the logic of the slides and estimates the cost of their rendering in seconds
+for each slide, the number of play() and wait() calls, of pauses, the total duration of the animations,
+the number of frames to render and the peak number of mobjects in the scene are reported
+"""
+import argparse
+import importlib.util
+import os
+import sys
+import time
+import traceback
+
+from manim import Camera, Wait, config
+
+from merge_slide import select_slides, slide_names, to_merge
+
+qualities = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+class NullRenderer:
+    """
+    renderer updating the mobjects to the end of each animation without rasterizing nor writing any frame
+    only the bookkeeping of the animations is kept
+    """
+
+    def __init__(self):
+        self.camera = Camera()
+        self.skip_animations = True
+        self.static_image = None
+        self.time = 0
+        self.num_plays = 0
+        self.num_waits = 0
+        self.peak_mobjects = 0
+
+    def init_scene(self, scene):
+        pass
+
+    def play(self, scene, *args, **kwargs):
+        scene.compile_animation_data(*args, **kwargs)
+        if len(scene.animations) == 1 and isinstance(scene.animations[0], Wait):
+            self.num_waits += 1
+        else:
+            self.num_plays += 1
+        scene.begin_animations()
+        self.count_mobjects(scene)
+        if not scene.is_current_animation_frozen_frame():
+            scene.play_internal(skip_rendering=True)
+        self.count_mobjects(scene)
+        self.time += scene.duration
+
+    def count_mobjects(self, scene):
+        self.peak_mobjects = max(self.peak_mobjects, len(scene.get_mobject_family_members()))
+
+    def update_frame(self, *args, **kwargs):
+        pass
+
+    def render(self, *args, **kwargs):
+        pass
+
+    def get_frame(self):
+        return self.camera.pixel_array
+
+    def scene_finished(self, scene):
+        pass
+
+
+def load_slides(file_name=to_merge):
+    # import the file of the slides, whose name is not a valid module name
+    folder = os.path.dirname(os.path.abspath(file_name))
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location("slides", file_name)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def dry_run(slide_class, renderer=None):
+    # statistics of one slide, the error raised by its construct() if any
+    renderer = renderer or NullRenderer()
+    start = time.perf_counter()
+    error = None
+    scene = slide_class(renderer=renderer)
+    try:
+        scene.setup()
+        scene.construct()
+        scene.tear_down()
+    except Exception:
+        error = traceback.format_exc()
+    return dict(
+        slide=slide_class.__name__,
+        plays=renderer.num_plays,
+        waits=renderer.num_waits,
+        pauses=len(scene.slides),
+        duration=renderer.time,
+        frames=int(round(renderer.time * config.frame_rate)),
+        peak_mobjects=renderer.peak_mobjects,
+        construction=time.perf_counter() - start,
+        error=error,
+    )
+
+
+def dry_run_slides(file_name=to_merge, spec=None):
+    names = slide_names(file_name)
+    if spec is not None:
+        names = select_slides(names, spec)
+    module = load_slides(file_name)
+    return [dry_run(getattr(module, name)) for name in names]
+
+
+def report(results):
+    header = f"{'slide':<20}{'plays':>7}{'waits':>7}{'pauses':>8}{'duration':>10}{'frames':>8}{'mobjects':>10}{'time':>8}"
+    print(header)
+    for r in results:
+        print(f"{r['slide']:<20}{r['plays']:>7}{r['waits']:>7}{r['pauses']:>8}{r['duration']:>9.1f}s"
+              f"{r['frames']:>8}{r['peak_mobjects']:>10}{r['construction']:>7.2f}s")
+    print(f"{'total':<20}{sum(r['plays'] for r in results):>7}{sum(r['waits'] for r in results):>7}"
+          f"{sum(r['pauses'] for r in results):>8}{sum(r['duration'] for r in results):>9.1f}s"
+          f"{sum(r['frames'] for r in results):>8}{max(r['peak_mobjects'] for r in results):>10}"
+          f"{sum(r['construction'] for r in results):>7.2f}s")
+    for r in results:
+        if r["error"] is not None:
+            print(f"\n{r['slide']} failed\n{r['error']}", file=sys.stderr)
+    return all(r["error"] is None for r in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"execute the slides from {to_merge} without rendering them")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to execute, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("-q", "--quality", default="h", choices="lmhpk", help="quality used to count the frames")
+    args = parser.parse_args()
+
+    config.quality = qualities[args.quality]
+    config.progress_bar = "none"
+    if not report(dry_run_slides(spec=args.slides)):
+        sys.exit(1)
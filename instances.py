@@ -0,0 +1,110 @@
+# loaders of the TSPTW benchmark instances (rbg092a, rbg233, ...) with a binary cache
+"""
+the rbg instances are read in the format of the TSPTW benchmarks of Lopez-Ibanez and Blum:
+- the number of nodes n, the depot being node 0
+- the n x n matrix of transition times, one row per line
+- the time window of each node, one "earliest latest" pair per line
+the files give no coordinates: the nodes are placed in the plane by classical multidimensional scaling of the
+symmetrized matrix, nodes close in time being close on the slides
+the parsed arrays are saved as .npy files in cache_folder/<name>-<hash of the file>/ and loaded memory-mapped,
+such that a slide using an instance does not parse its text again
+"""
+import argparse
+import hashlib
+import os
+from collections import namedtuple
+
+import numpy as np
+
+instance_folder = "instances"
+cache_folder = "instance_cache"
+extensions = ["", ".tw", ".txt"]
+
+Instance = namedtuple("Instance", ["name", "coords", "windows", "transitions"])
+
+
+def instance_file(name):
+    # path of an instance given by its path or by its name in instance_folder
+    for folder in ["", instance_folder]:
+        for extension in extensions:
+            path = os.path.join(folder, name + extension)
+            if os.path.isfile(path):
+                return path
+    raise FileNotFoundError(f"no instance {name} in {os.path.abspath(instance_folder)}")
+
+
+def parse(text):
+    # (windows, transitions) of the text of an instance
+    values = np.array(text.split(), dtype=float)
+    n = int(values[0])
+    if len(values) < 1 + n * n + 2 * n:
+        raise ValueError(f"expected {n} x {n} transitions and {n} time windows, got {len(values) - 1} values")
+    transitions = values[1:1 + n * n].reshape(n, n)
+    windows = values[1 + n * n:1 + n * n + 2 * n].reshape(n, 2)
+    return windows, transitions
+
+
+def embed(transitions):
+    # (n, 3) points whose distances approximate the transition times, by classical multidimensional scaling
+    distances = (transitions + transitions.T) / 2
+    n = len(distances)
+    centering = np.eye(n) - 1 / n
+    gram = -0.5 * centering @ (distances ** 2) @ centering
+    values, vectors = np.linalg.eigh(gram)
+    # largest eigenvalues come last
+    plane = vectors[:, -2:][:, ::-1] * np.sqrt(np.maximum(values[-2:][::-1], 0))
+    return np.concatenate([plane, np.zeros((n, 1))], axis=1)
+
+
+def _cache_path(path):
+    with open(path, "rb") as file:
+        digest = hashlib.sha256(file.read()).hexdigest()[:16]
+    return os.path.join(cache_folder, f"{os.path.basename(path)}-{digest}")
+
+
+def _write_cache(folder, arrays):
+    # written to a temporary folder first, such that a partial cache is never read
+    temporary = f"{folder}.{os.getpid()}.tmp"
+    os.makedirs(temporary, exist_ok=True)
+    for key, array in arrays.items():
+        np.save(os.path.join(temporary, key + ".npy"), array)
+    try:
+        os.rename(temporary, folder)
+    except OSError:
+        # written meanwhile by another process
+        for key in arrays:
+            os.remove(os.path.join(temporary, key + ".npy"))
+        os.rmdir(temporary)
+
+
+def load_instance(name):
+    # Instance with memory-mapped arrays, parsed and cached on first use
+    path = instance_file(name)
+    folder = _cache_path(path)
+    if not os.path.isdir(folder):
+        with open(path) as file:
+            windows, transitions = parse(file.read())
+        _write_cache(folder, dict(coords=embed(transitions), windows=windows, transitions=transitions))
+    arrays = {key: np.load(os.path.join(folder, key + ".npy"), mmap_mode="r")
+              for key in ["coords", "windows", "transitions"]}
+    return Instance(os.path.splitext(os.path.basename(path))[0], **arrays)
+
+
+def load_routes(path):
+    # routes of a solution, one route per line given by its nodes separated by spaces or commas
+    with open(path) as file:
+        return [[int(node) for node in line.replace(",", " ").split()] for line in file if line.strip()]
+
+
+def earliest_order(instance):
+    # nodes sorted by the start of their time window, the depot first, as a default tour
+    return [0] + [node + 1 for node in np.argsort(instance.windows[1:, 0], kind="stable")]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"parse TSPTW instances and store them in {cache_folder}")
+    parser.add_argument("names", nargs="+", help=f"paths of the instances or names in {instance_folder}/")
+    args = parser.parse_args()
+    for name in args.names:
+        instance = load_instance(name)
+        print(f"{instance.name}: {len(instance.windows)} nodes, horizon {instance.windows[:, 1].max():g}")
@@ -2,53 +2,184 @@
 """
 all slides are merged in the order in which they are written
 all construct() MUST end with a self.pause()\nself.wait() instruction
+the body of each construct() is copied as it is written, the final self.wait() being replaced by a self.clear()
+for all slides but the last one
+the merged fragment of each slide is cached by the hash of its source: after editing one slide,
+only this slide is processed again
+a subset of the slides can be merged (and rendered) instead, for instance Sequences..TransitionTime
 """
-import re
+import argparse
+import ast
+import hashlib
+import os
+import subprocess
+import sys
 
 to_merge = "sequence-slide.py"
 merged = "presentation.py"
+merged_subset = "presentation_subset.py"  # written by default when only some slides are merged
+cache_folder = "merge_cache"
 INDENT = " " * 4  # base indent from within the file
+new_slide_demark = f"{INDENT * 2}# {'=' * 30}\n"
 
-if __name__ == "__main__":
-    bottom_line_creation = 'slide_number = Text("1", color=BLUE)'
 
+def is_slide(node):
+    return isinstance(node, ast.ClassDef) and any(isinstance(base, ast.Name) and base.id == "Slide"
+                                                  for base in node.bases)
+
+
+def is_self_call(node, method):
+    # node is a self.method() instruction
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Call) \
+        and isinstance(node.value.func, ast.Attribute) and node.value.func.attr == method \
+        and isinstance(node.value.func.value, ast.Name) and node.value.func.value.id == "self"
+
+
+def _start(node):
+    # first line of a top-level statement, decorators included (0-indexed)
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])]) - 1
+
+
+def parse_slides(source):
+    """
+    split a file into its header (everything that is not a slide) and its slides
+    each slide is given by its name and the source of its class, up to the next statement
+    """
+    tree = ast.parse(source)
+    lines = source.splitlines(keepends=True)
+    starts = [_start(node) for node in tree.body] + [len(lines)]
     header = []
-    construct = []
-    pattern_construct = "\W+def\W+construct\W*\(\W*self\W*\)\W*:"
-    pattern_slide = "class\W+(.+)\(\W*Slide\W*\)\W*:"
-    in_construct = False
-    in_header = True
-    new_slide_demark = f"{INDENT * 2}# {'=' * 30}\n"
+    slides = []
+    for i, node in enumerate(tree.body):
+        # comments and blank lines before the first statement belong to the header
+        start = 0 if i == 0 else starts[i]
+        segment = "".join(lines[start:starts[i + 1]])
+        if is_slide(node):
+            slides.append((node.name, segment))
+        else:
+            header.append(segment)
+    return "".join(header), slides
+
+
+def slide_names(file_name=to_merge):
+    # names of the Slide subclasses, in the order in which they are written
+    with open(file_name) as file:
+        return [name for name, _ in parse_slides(file.read())[1]]
+
+
+def select_slides(names, spec):
+    """
+    names of the slides selected by spec, in the order in which they are written
+    spec is a comma-separated list of slide names and inclusive ranges first..last, where first or last can be omitted
+    a range whose last slide comes before its first one, or a spec selecting no slide, raises a ValueError
+    """
+    def index(name, default):
+        if not name:
+            return default
+        if name not in names:
+            raise ValueError(f"unknown slide {name}, the slides are {', '.join(names)}")
+        return names.index(name)
+
+    selected = set()
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if ".." in item:
+            first, last = item.split("..", 1)
+            start, end = index(first.strip(), 0), index(last.strip(), len(names) - 1)
+            if end < start:
+                raise ValueError(f"empty range {item}: {names[end]} comes before {names[start]}")
+            selected.update(range(start, end + 1))
+        else:
+            selected.add(index(item, None))
+    if not selected:
+        raise ValueError(f"no slide selected by {spec!r}")
+    return [name for i, name in enumerate(names) if i in selected]
+
+
+def merge_fragment(name, segment, last):
+    # body of construct() for the merged presentation
+    node = ast.parse(segment).body[0]
+    construct = [n for n in node.body if isinstance(n, ast.FunctionDef) and n.name == "construct"]
+    if not construct:
+        raise ValueError(f"slide {name} has no construct()")
+    construct = construct[0]
+    body = construct.body
+    if len(body) < 2 or not is_self_call(body[-2], "pause") or not is_self_call(body[-1], "wait"):
+        raise ValueError(f"{name}.construct() must end with self.pause() and self.wait()")
+    lines = segment.splitlines(keepends=True)
+    begin = body[0].lineno - 1
+    # keep the comments and blank lines between the signature and the first instruction
+    while begin > 0 and (not lines[begin - 1].strip() or lines[begin - 1].strip().startswith("#")):
+        begin -= 1
+    # the blank lines after the class are kept as well
+    content = lines[begin:construct.end_lineno] + lines[node.end_lineno:]
+    if not last:
+        # the slide is cleared instead of waiting
+        wait = body[-1]
+        i = wait.lineno - 1 - begin
+        line = content[i]
+        if wait.end_lineno == wait.lineno:
+            content[i] = line[:wait.col_offset] + "self.clear()" + line[wait.end_col_offset:]
+        else:
+            content[i:wait.end_lineno - begin] = [f"{line[:wait.col_offset]}self.clear()\n"]
+    return f"\n{new_slide_demark}{INDENT * 2}# SLIDE {name}\n{new_slide_demark}\n" + "".join(content)
+
+
+def cached_fragment(name, segment, last):
+    # only the slides modified since the last merge are processed
+    key = hashlib.sha256(f"{name}\n{last}\n{segment}".encode()).hexdigest()
+    path = os.path.join(cache_folder, f"{key}.txt")
+    if os.path.isfile(path):
+        with open(path) as file:
+            return file.read()
+    fragment = merge_fragment(name, segment, last)
+    os.makedirs(cache_folder, exist_ok=True)
+    with open(path, "w") as file:
+        file.write(fragment)
+    return fragment
+
+
+def merge(source, spec=None):
+    header, slides = parse_slides(source)
+    if spec is not None:
+        selected = select_slides([name for name, _ in slides], spec)
+        slides = [(name, segment) for name, segment in slides if name in selected]
+    construct = [cached_fragment(name, segment, i == len(slides) - 1) for i, (name, segment) in enumerate(slides)]
+    # TODO add bottom text with slide number (lower right part)
+    return header + f"class Presentation(Slide):\n\n{INDENT}def construct(self):\n" + "".join(construct)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"merge the slides from {to_merge} into one presentation")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to merge, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("-o", "--output", default=None,
+                        help=f"file written ({merged}, or {merged_subset} when slides are selected)")
+    parser.add_argument("-r", "--render", action="store_true", help="render the merged presentation")
+    parser.add_argument("-q", "--quality", default="l", choices="lmhpk", help="manim render quality")
+    args = parser.parse_args()
+    if args.output is None:
+        # a subset does not replace the whole presentation
+        args.output = merged if args.slides is None else merged_subset
 
     with open(to_merge) as file:
-        for line in file:
-            if (search_obj := re.search(pattern_construct, line)) is not None:
-                # within a new construct
-                in_construct = True
-                if construct:
-                    # content already written to construct
-                    # get back to the previous "self.pause(), self.wait()" instructions written
-                    # and remove the self.wait() by a self.clear()
-                    for i, content in enumerate(construct[::-1]):
-                        if "self.wait()" in content:
-                            replaced = content.replace("self.wait()", "self.clear()")
-                            construct[-(i + 1)] = replaced
-                            break
-            elif (search_obj := re.search(pattern_slide, line)) is not None:
-                class_name = search_obj.group(1)
-                construct.append(f"\n{new_slide_demark}{INDENT * 2}# SLIDE {class_name}\n{new_slide_demark}\n")
-                in_header = False
-                in_construct = False
-                # within a new Slide
-            else:
-                if in_header:
-                    # always append the header
-                    header.append(line)
-                elif in_construct:
-                    construct.append(line)
-
-    with open(merged, "w") as file:
-        file.writelines(header)
-        file.writelines(["class Presentation(Slide):\n", "\n", f"{INDENT}def construct(self):\n"])
-        # TODO add bottom text with slide number (lower right part)
-        file.writelines(construct)
+        try:
+            presentation = merge(file.read(), args.slides)
+        except ValueError as error:
+            parser.error(str(error))
+    # keep the file untouched if nothing changed
+    previous = None
+    if os.path.isfile(args.output):
+        with open(args.output) as file:
+            previous = file.read()
+    if previous != presentation:
+        with open(args.output, "w") as file:
+            file.write(presentation)
+    if args.render:
+        from check_slides import check_slides, report
+
+        if not report(check_slides(to_merge, args.slides)):
+            sys.exit(1)
+        subprocess.run(["manim", f"-q{args.quality}", args.output, "Presentation"], check=True)
@@ -1,3 +1,5 @@
+from abc import ABC, abstractmethod
+
 from utils import *
 
 
@@ -8,16 +10,23 @@ class DashedArrow(Arrow):
         *args,
         dash_length=DEFAULT_DASH_LENGTH,
         dashed_ratio=0.5,
+        analytic=True,
         **kwargs
     ):
         self.dash_length = dash_length
         self.dashed_ratio = dashed_ratio
         super().__init__(*args, **kwargs)
-        dashes = DashedVMobject(
-            self,
-            num_dashes=self._calculate_num_dashes(),
-            dashed_ratio=dashed_ratio,
-        )
+        num_dashes = self._calculate_num_dashes()
+        if analytic and self.path_arc == 0:
+            # straight arrow: the dashes are placed directly, in a single mobject, as DashedVMobject would do
+            dashes = [VMobject().match_style(self, family=False).set_points(
+                _dash_points(self.points[:1], self.points[-1:], [num_dashes], dashed_ratio))]
+        else:
+            dashes = DashedVMobject(
+                self,
+                num_dashes=num_dashes,
+                dashed_ratio=dashed_ratio,
+            )
         self.clear_points()
         self.add(*dashes)
 
@@ -37,3 +46,1064 @@ class DashedArrow(Arrow):
             2,
             int(np.ceil((self.get_length() / self.dash_length) * self.dashed_ratio)),
         )
+
+
+def _selected_lines(spec, count):
+    # indices of the lines drawn among count lines
+    if spec is None:
+        return []
+    if spec == "all":
+        return list(range(count))
+    if callable(spec):
+        return [i for i in range(count) if spec(i)]
+    return sorted({i % count for i in spec if -count <= i < count})
+
+
+class SparseLines:
+    """
+    Table building only the lines that are drawn, instead of building all of them and removing most afterwards.
+
+    h_lines and v_lines select the lines by their index in get_horizontal_lines() and get_vertical_lines() of a
+    regular table (the outer lines coming first if include_outer_lines is set): "all", None for no line,
+    a list of indices or a predicate on the index. Only the selected lines are in get_horizontal_lines()
+    and get_vertical_lines().
+    """
+
+    def __init__(
+        self,
+        *args,
+        h_lines="all",
+        v_lines="all",
+        **kwargs
+    ):
+        self.h_lines = h_lines
+        self.v_lines = v_lines
+        super().__init__(*args, **kwargs)
+
+    def _add_lines(self, anchors, spec, endpoints):
+        lines = VGroup(*[Line(*endpoints(anchors[i]), **self.line_config)
+                         for i in _selected_lines(spec, len(anchors))])
+        self.add(*lines)
+        return lines
+
+    def _add_horizontal_lines(self):
+        rows = self.get_rows()
+        tops = [row.get_top()[1] for row in rows]
+        bottoms = [row.get_bottom()[1] for row in rows]
+        anchors = []
+        if self.include_outer_lines:
+            anchors += [tops[0] + 0.5 * self.v_buff, bottoms[-1] - 0.5 * self.v_buff]
+        anchors += [0.5 * (tops[k + 1] + bottoms[k]) for k in range(len(rows) - 1)]
+        left = self.get_left()[0] - 0.5 * self.h_buff
+        right = self.get_right()[0] + 0.5 * self.h_buff
+        self.horizontal_lines = self._add_lines(anchors, self.h_lines,
+                                                lambda y: ([left, y, 0], [right, y, 0]))
+        return self
+
+    def _add_vertical_lines(self):
+        columns = self.get_columns()
+        lefts = [column.get_left()[0] for column in columns]
+        rights = [column.get_right()[0] for column in columns]
+        anchors = []
+        if self.include_outer_lines:
+            anchors += [lefts[0] - 0.5 * self.h_buff, rights[-1] + 0.5 * self.h_buff]
+        anchors += [0.5 * (lefts[k + 1] + rights[k]) for k in range(len(columns) - 1)]
+        rows = self.get_rows()
+        top = rows.get_top()[1] + 0.5 * self.v_buff
+        bottom = rows.get_bottom()[1] - 0.5 * self.v_buff
+        self.vertical_lines = self._add_lines(anchors, self.v_lines,
+                                              lambda x: ([x, bottom, 0], [x, top, 0]))
+        return self
+
+
+class SparseMobjectTable(SparseLines, MobjectTable):
+    pass
+
+
+class SparseMathTable(SparseLines, MathTable):
+    pass
+
+
+class GrowingTable(VGroup):
+    """
+    Table whose rows and columns are added in place: the cells already in the table are moved to their new
+    position and only the new cells and lines are built and animated, the top left corner staying where it is.
+
+    The cells are mobjects, arranged as in a MobjectTable. The lines are selected by h_lines and v_lines as in
+    SparseLines, their index being the one they would have in the final table.
+    The scale of the table is given by a short invisible ruler, as in InstanceField, such that the buffers and the
+    cells given to set_cells follow it through .animate and the animations scaling the table.
+    """
+
+    ruler_length = 1e-3
+
+    def __init__(
+        self,
+        table,
+        v_buff=0.8,
+        h_buff=1.3,
+        include_outer_lines=False,
+        h_lines="all",
+        v_lines="all",
+        cell_alignment=ORIGIN,
+        line_config={},
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.v_buff = v_buff
+        self.h_buff = h_buff
+        self.include_outer_lines = include_outer_lines
+        self.h_lines = h_lines
+        self.v_lines = v_lines
+        self.cell_alignment = np.array(cell_alignment)
+        self.line_config = line_config
+        self.mob_table = [list(row) for row in table]
+        self.elements = VGroup(*[cell for row in self.mob_table for cell in row])
+        self.horizontal_lines = VGroup()
+        self.vertical_lines = VGroup()
+        # the ruler lies on the top left corner, so that it stays within the table
+        self.ruler = VMobject(stroke_width=0, fill_opacity=0)
+        self.ruler.set_points(_segment_points(ORIGIN, ORIGIN + self.ruler_length * RIGHT))
+        self.add(self.elements, self.horizontal_lines, self.vertical_lines, self.ruler)
+        self._arrange(ORIGIN)
+        self.center()
+
+    def _arrange(self, corner):
+        # place the cells and the lines of a grid whose top left corner is at corner
+        h_buff, v_buff = self.get_scale() * self.h_buff, self.get_scale() * self.v_buff
+        widths = [max(row[j].width for row in self.mob_table) for j in range(len(self.mob_table[0]))]
+        heights = [max(cell.height for cell in row) for row in self.mob_table]
+        lefts = corner[0] + np.concatenate([[0], np.cumsum(np.array(widths[:-1]) + h_buff)])
+        tops = corner[1] - np.concatenate([[0], np.cumsum(np.array(heights[:-1]) + v_buff)])
+        for i, row in enumerate(self.mob_table):
+            for j, cell in enumerate(row):
+                center = np.array([lefts[j] + widths[j] / 2, tops[i] - heights[i] / 2, 0])
+                slack = np.array([widths[j] - cell.width, heights[i] - cell.height, 0]) / 2
+                cell.move_to(center + self.cell_alignment * slack)
+
+        left = lefts[0] - h_buff / 2
+        right = lefts[-1] + widths[-1] + h_buff / 2
+        top = tops[0] + v_buff / 2
+        bottom = tops[-1] - heights[-1] - v_buff / 2
+        h_anchors = [top, bottom] if self.include_outer_lines else []
+        h_anchors += [y + v_buff / 2 for y in tops[1:]]
+        v_anchors = [left, right] if self.include_outer_lines else []
+        v_anchors += [x - h_buff / 2 for x in lefts[1:]]
+        self._place_lines(self.horizontal_lines, [([left, y, 0], [right, y, 0])
+                                                  for y in np.array(h_anchors)[_selected_lines(self.h_lines, len(h_anchors))]])
+        self._place_lines(self.vertical_lines, [([x, bottom, 0], [x, top, 0])
+                                                for x in np.array(v_anchors)[_selected_lines(self.v_lines, len(v_anchors))]])
+
+    def _place_lines(self, lines, ends):
+        # the lines already built are moved, the missing ones are created
+        for line, (start, end) in zip(lines, ends):
+            line.put_start_and_end_on(np.array(start, dtype=float), np.array(end, dtype=float))
+        for start, end in ends[len(lines):]:
+            line = Line(start, end, **self.line_config)
+            lines.add(line)
+
+    def _snapshot(self):
+        # cells and lines with their current place, before the table changes
+        lines = [*self.horizontal_lines, *self.vertical_lines]
+        return ([(cell, cell.get_center()) for cell in self.elements],
+                [(line, (line.get_start(), line.get_end())) for line in lines])
+
+    def _moves(self, snapshot):
+        """
+        animations moving the cells and lines of the snapshot still in the table from their place in the snapshot
+        to their current place, the other ones being put back to their place in the snapshot
+        """
+        cells, lines = snapshot
+        animations = []
+        for cell, start in cells:
+            end = cell.get_center()
+            if not np.allclose(start, end):
+                cell.move_to(start)
+                animations.append(cell.animate.move_to(end))
+        for line, (start, end) in lines:
+            new_start, new_end = line.get_start(), line.get_end()
+            if not np.allclose([start, end], [new_start, new_end]):
+                line.put_start_and_end_on(start, end)
+                animations.append(line.animate.put_start_and_end_on(new_start, new_end))
+        old_lines = [line for line, _ in lines]
+        animations += [Create(line) for line in [*self.horizontal_lines, *self.vertical_lines]
+                       if line not in old_lines]
+        return animations
+
+    def grow(self, rows=(), columns=(), **kwargs):
+        """
+        Animation adding columns (a list of cells for each column, one per current row) then rows (a list of
+        cells for each row) to the table. The table is already in its final state when the animation is built.
+        """
+        corner = self.elements.get_corner(UL)
+        snapshot = self._snapshot()
+        if columns and any(len(column) != len(self.mob_table) for column in columns):
+            raise ValueError("a new column must have one cell per row of the table")
+        for row, cells in zip(self.mob_table, zip(*columns)):
+            row.extend(cells)
+        for row in rows:
+            if len(row) != len(self.mob_table[0]):
+                raise ValueError("a new row must have one cell per column of the table")
+            self.mob_table.append(list(row))
+        new_cells = [cell for column in columns for cell in column] + [cell for row in rows for cell in row]
+        self.elements.add(*new_cells)
+        self._arrange(corner)
+
+        animations = self._moves(snapshot)
+        if new_cells:
+            animations.append(FadeIn(VGroup(*new_cells)))
+        return AnimationGroup(*animations, **kwargs)
+
+    def set_cells(self, cells, **kwargs):
+        """
+        Animation replacing cells of the table, given as {(row, column): mobject} with (1, 1) the top left cell:
+        the old cells fade out, the new ones fade in and the other cells move if the sizes of the rows or
+        columns change. The cells not given are neither rebuilt nor animated unless they move. The new cells,
+        built at scale 1, are scaled as the table.
+        """
+        corner = self.elements.get_corner(UL)
+        snapshot = self._snapshot()
+        old_cells = []
+        for (i, j), cell in cells.items():
+            cell.scale(self.get_scale())
+            old = self.mob_table[i - 1][j - 1]
+            self.elements.submobjects[self.elements.submobjects.index(old)] = cell
+            self.mob_table[i - 1][j - 1] = cell
+            old_cells.append(old)
+        self._arrange(corner)
+
+        animations = self._moves(([(cell, start) for cell, start in snapshot[0] if cell not in old_cells],
+                                  snapshot[1]))
+        if cells:
+            animations += [FadeOut(VGroup(*old_cells)), FadeIn(VGroup(*cells.values()))]
+        return AnimationGroup(*animations, **kwargs)
+
+    def get_horizontal_lines(self):
+        return self.horizontal_lines
+
+    def get_vertical_lines(self):
+        return self.vertical_lines
+
+    def get_rows(self):
+        return VGroup(*[VGroup(*row) for row in self.mob_table])
+
+    def get_columns(self):
+        return VGroup(*[VGroup(*[row[j] for row in self.mob_table]) for j in range(len(self.mob_table[0]))])
+
+    def get_cell(self, pos=(1, 1), **kwargs):
+        # rectangle of a cell, (1, 1) being the top left cell
+        row = self.get_rows()[pos[0] - 1]
+        col = self.get_columns()[pos[1] - 1]
+        h_buff, v_buff = self.get_scale() * self.h_buff, self.get_scale() * self.v_buff
+        left = col.get_left()[0] - h_buff / 2
+        right = col.get_right()[0] + h_buff / 2
+        top = row.get_top()[1] + v_buff / 2
+        bottom = row.get_bottom()[1] - v_buff / 2
+        return Polygon([left, top, 0], [right, top, 0], [right, bottom, 0], [left, bottom, 0], **kwargs)
+
+    def get_scale(self):
+        # scale of the table since it was built, h_buff and v_buff being the buffers at scale 1
+        ruler = self.ruler.points
+        return np.linalg.norm(ruler[-1] - ruler[0]) / self.ruler_length
+
+    def get_points_defining_boundary(self):
+        # the ruler is not drawn: only the cells and the lines count to place the table
+        return np.concatenate([m.get_all_points() for m in self.submobjects if m is not self.ruler])
+
+
+def _segment_points(start, end):
+    # bezier points of straight curves from start to end, arrays of points of the same shape
+    t = np.linspace(0, 1, 4).reshape((1,) * (np.ndim(start) - 1) + (4, 1))
+    start, end = np.expand_dims(start, -2), np.expand_dims(end, -2)
+    return start + t * (end - start)
+
+
+def _polygon_points(corners):
+    # bezier points of closed polygons, corners being of shape (polygons, corners + 1, 3), the last one the first
+    return _segment_points(corners[:, :-1], corners[:, 1:]).reshape(-1, 3)
+
+
+def _rectangle_points(left, right, bottom, top):
+    # bezier points of closed rectangles, one subpath of 4 straight curves per rectangle
+    corners = np.stack([
+        np.stack([left, bottom], axis=-1),
+        np.stack([right, bottom], axis=-1),
+        np.stack([right, top], axis=-1),
+        np.stack([left, top], axis=-1),
+        np.stack([left, bottom], axis=-1),
+    ], axis=1)
+    corners = np.concatenate([corners, np.zeros(corners.shape[:-1] + (1,))], axis=-1)
+    return _polygon_points(corners)
+
+
+class TimeWindowBars(VGroup):
+    """
+    Time windows of many nodes, drawn above them as bars red before the window, green during it and red after it.
+
+    The windows are (earliest, latest) times within [0, horizon], and all the bars are drawn by two mobjects: one
+    for the red parts and one for the green parts, whose points are computed at once.
+    The number of points never changes, so that set_windows can be animated with .animate. The frame of the bars
+    (their corners and the centers of the nodes) is kept as invisible points, and the windows are read back from
+    the points, such that the bars follow the moves, scalings and animations of the mobject.
+    """
+
+    def __init__(
+        self,
+        windows,
+        nodes,
+        horizon=99,
+        width=0.99,
+        height=0.1,
+        buff=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER,
+        outside_color=RED,
+        inside_color=GREEN,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.horizon = horizon
+        # nodes are a NodeLayer, mobjects or points, the bars are placed above them
+        if isinstance(nodes, NodeLayer):
+            centers = nodes.get_centers()
+            tops = centers + nodes.get_radii()[:, None] * UP
+        elif len(nodes) and isinstance(nodes[0], Mobject):
+            centers = np.array([node.get_center() for node in nodes])
+            tops = np.array([node.get_top() for node in nodes])
+        else:
+            centers = np.array(nodes, dtype=float).reshape(-1, 3)
+            tops = centers
+        lower_left = tops + (buff * UP + width / 2 * LEFT)
+        upper_right = lower_left + (width * RIGHT + height * UP)
+        # per node, the diagonal of its bar followed by its center, as a curve reduced to one point
+        self.frame = VMobject(stroke_width=0, fill_opacity=0)
+        self.frame.set_points(_segment_points(
+            np.stack([lower_left, centers], axis=1), np.stack([upper_right, centers], axis=1)).reshape(-1, 3))
+        self.outside = VMobject(fill_color=outside_color, fill_opacity=1, stroke_width=0)
+        self.inside = VMobject(fill_color=inside_color, fill_opacity=1, stroke_width=0)
+        self.add(self.frame, self.outside, self.inside)
+        self.set_windows(windows)
+
+    def _frame(self):
+        # lower left and upper right corners of the bars, and centers of the nodes
+        frame = self.frame.points.reshape(-1, 2, 4, 3)
+        return frame[:, 0, 0], frame[:, 0, 3], frame[:, 1, 0]
+
+    def get_points_defining_boundary(self):
+        # the frame is not drawn: only the bars count to place them
+        return np.concatenate([self.outside.get_anchors(), self.inside.get_anchors()])
+
+    def set_windows(self, windows):
+        # new (earliest, latest) time of every node
+        windows = np.clip(np.array(windows, dtype=float).reshape(-1, 2), 0, self.horizon)
+        lower_left, upper_right, _ = self._frame()
+        left, bottom, right, top = lower_left[:, 0], lower_left[:, 1], upper_right[:, 0], upper_right[:, 1]
+        earliest = left + windows[:, 0] / self.horizon * (right - left)
+        latest = left + windows[:, 1] / self.horizon * (right - left)
+        # before and after the window of each node
+        self.outside.set_points(_rectangle_points(
+            np.stack([left, latest], axis=1).ravel(), np.stack([earliest, right], axis=1).ravel(),
+            np.repeat(bottom, 2), np.repeat(top, 2)))
+        self.inside.set_points(_rectangle_points(earliest, latest, bottom, top))
+        return self
+
+    def get_windows(self):
+        # (earliest, latest) time of every node, given by the place of the green part within the bar
+        inside = self.inside.points[:, 0].reshape(-1, 16)
+        lower_left, upper_right, _ = self._frame()
+        left, right = lower_left[:, 0], upper_right[:, 0]
+        times = (np.stack([inside.min(axis=1), inside.max(axis=1)], axis=1) - left[:, None]) / (right - left)[:, None]
+        return times * self.horizon
+
+    def bar_centers(self):
+        lower_left, upper_right, _ = self._frame()
+        return (lower_left + upper_right) / 2
+
+    def collapse(self, points=None):
+        # every point of the bar of a node moved to one point, the center of its node by default
+        points = self._frame()[2] if points is None else np.array(points, dtype=float)
+        for part, per_node in (self.outside, 32), (self.inside, 16):
+            part.set_points(np.repeat(points, per_node, axis=0))
+        return self
+
+    def grow(self, **kwargs):
+        # animation growing each bar from its node
+        target = self.copy()
+        self.collapse()
+        return Transform(self, target, **kwargs)
+
+    def shrink(self, **kwargs):
+        # animation shrinking each bar to its center
+        return Transform(self, self.copy().collapse(self.bar_centers()), **kwargs)
+
+
+def _dash_points(starts, ends, num_dashes, dashed_ratio):
+    # bezier points of the dashes of straight lines, laid out as DashedVMobject does on open curves
+    num_dashes = np.asarray(num_dashes)
+    line = np.repeat(np.arange(len(num_dashes)), num_dashes)
+    k = np.arange(len(line)) - np.repeat(np.cumsum(num_dashes) - num_dashes, num_dashes)
+    dash = dashed_ratio / num_dashes[line]
+    void = (1 - dashed_ratio) / np.maximum(num_dashes[line] - 1, 1)
+    a = (k * (dash + void))[:, None]
+    vector = (ends - starts)[line]
+    return _segment_points(starts[line] + a * vector, starts[line] + (a + dash[:, None]) * vector).reshape(-1, 3)
+
+
+def _arrow_geometry(starts, ends, buff, tip_length):
+    # start and end of the line and corners of the tip of straight arrows, as in Arrow
+    vector = ends - starts
+    length = np.linalg.norm(vector, axis=1)
+    unit = np.tile(RIGHT.astype(float), (len(vector), 1))
+    np.divide(vector, length[:, None], out=unit, where=length[:, None] > 0)
+    buff = np.minimum(buff, length / 2)
+    line_starts = starts + buff[:, None] * unit
+    tip_ends = ends - buff[:, None] * unit
+    tip = np.minimum(tip_length, 0.25 * (length - 2 * buff))
+    line_ends = tip_ends - tip[:, None] * unit
+    normal = np.stack([-unit[:, 1], unit[:, 0], np.zeros(len(unit))], axis=1) * (tip[:, None] / 2)
+    tips = np.stack([tip_ends, line_ends + normal, line_ends - normal, tip_ends], axis=1)
+    return line_starts, line_ends, tips
+
+
+def _grown_arrows(line_starts, line_ends, tips, growth=None):
+    # line ends and tips of arrows scaled from their start by growth, if given
+    if growth is None:
+        return line_ends, tips
+    growth = np.asarray(growth, dtype=float)
+    return (line_starts + growth[:, None] * (line_ends - line_starts),
+            line_starts[:, None] + growth[:, None, None] * (tips - line_starts[:, None]))
+
+
+class InstanceField(VGroup, ABC):
+    """
+    Many similar shapes, designated by their index, drawn by a single pair of mobjects per color instead of
+    one mobject each. Every instance is placed by two anchor points (start and end), and has a color and a
+    visibility. The points of all the instances of one color are computed at once with numpy by the subclasses,
+which implement the abstract methods _layer, geometry and _set_layer.
+
+    The anchors are kept as invisible points of the mobject, followed by a short ruler at the first anchor giving the
+    scale of the field, such that it can be moved, scaled and animated as any other mobject.
+    change, fade_out, fade_in, recolor and indicate return the animation of a subset of the instances, which are
+    moved to separate "active" layers: only one of them can be played at a time on a field.
+    """
+
+    ruler_length = 1e-3
+
+    def __init__(self, starts, ends, color=WHITE, **kwargs):
+        super().__init__(**kwargs)
+        starts = np.array(starts, dtype=float).reshape(-1, 3)
+        ends = np.array(ends, dtype=float).reshape(-1, 3)
+        self.num_instances = len(starts)
+        self.palette = []
+        self.color_index = np.zeros(self.num_instances, dtype=int)
+        self.visible = np.ones(self.num_instances, dtype=bool)
+        # the ruler lies on the first anchor, so that it does not change the bounding box of groups of fields
+        ruler_start = starts[:1] if len(starts) else ORIGIN[None].astype(float)
+        self.anchors = VMobject(stroke_width=0, fill_opacity=0)
+        self.anchors.set_points(_segment_points(
+            np.concatenate([starts, ruler_start]),
+            np.concatenate([ends, ruler_start + self.ruler_length * RIGHT])).reshape(-1, 3))
+        self.layers = VGroup()
+        self.active = VGroup()
+        self.add(self.anchors, self.layers, self.active)
+        colors = color if isinstance(color, (list, tuple)) else [color] * self.num_instances
+        self.color_index[:] = [self._color_index(c) for c in colors]
+        self._build()
+
+    def _color_index(self, color):
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    @abstractmethod
+    def _layer(self, color):
+        """mobjects drawing the instances of one color"""
+
+    @abstractmethod
+    def geometry(self, **kwargs):
+        """arrays describing every instance, used by _set_layer"""
+
+    @abstractmethod
+    def _set_layer(self, layer, selected, geometry):
+        """points of the instances selected (boolean mask or indices) in a layer"""
+
+    def get_starts(self):
+        return self.anchors.points[:4 * self.num_instances:4].copy()
+
+    def get_ends(self):
+        return self.anchors.points[3:4 * self.num_instances:4].copy()
+
+    def _write_anchors(self, indices, starts, ends):
+        points = self.anchors.points
+        points[4 * np.asarray(indices, dtype=int)[:, None] + np.arange(4)] = _segment_points(
+            np.array(starts, dtype=float).reshape(-1, 3), np.array(ends, dtype=float).reshape(-1, 3))
+
+    def set_anchors(self, indices, starts, ends):
+        self._write_anchors(indices, starts, ends)
+        return self._build()
+
+    def get_scale(self):
+        ruler = self.anchors.points[4 * self.num_instances:]
+        return np.linalg.norm(ruler[-1] - ruler[0]) / self.ruler_length
+
+    def get_points_defining_boundary(self):
+        # the anchors and the ruler are not drawn: only the instances count to place the field
+        points = [m.get_anchors() for m in self.layers.get_family() + self.active.get_family() if m.has_points()]
+        if not points:
+            return self.anchors.get_anchors()
+        return np.concatenate(points)
+
+    def _build(self, groups=(), **kwargs):
+        """
+        draw the visible instances in the layers of their color, except the instances in groups: each group
+        (color, indices) is drawn by an active layer of its color
+        """
+        geometry = self.geometry(**kwargs)
+        is_active = np.zeros(self.num_instances, dtype=bool)
+        for _, selected in groups:
+            is_active[selected] = True
+        while len(self.layers) < len(self.palette):
+            self.layers.add(self._layer(self.palette[len(self.layers)]))
+        for c, layer in enumerate(self.layers):
+            self._set_layer(layer, self.visible & ~is_active & (self.color_index == c), geometry)
+        self.active.submobjects = []
+        for color, selected in groups:
+            layer = self._layer(color)
+            self._set_layer(layer, selected, geometry)
+            self.active.add(layer)
+        return self
+
+    def set_colors(self, indices, color):
+        self.color_index[list(indices)] = self._color_index(color)
+        return self._build()
+
+    def show(self, indices):
+        self.visible[list(indices)] = True
+        return self._build()
+
+    def hide(self, indices):
+        self.visible[list(indices)] = False
+        return self._build()
+
+    def extract(self, index):
+        # standalone mobject of one instance, which is hidden in the field
+        instance = self._layer(self.palette[self.color_index[index]])
+        self._set_layer(instance, np.array([index]), self.geometry())
+        self.hide([index])
+        return instance
+
+    def change(self, hide=(), show=(), colors=None, anchors=None, **kwargs):
+        """
+        one animation of the changes of several instances: the instances in hide fade out, the ones in show fade in,
+        the ones in colors ({index: color}) are recolored and the ones in anchors ({index: (start, end)}) move to
+        their new anchors, an instance both shown and moved growing from its old anchors instead of fading in.
+        The instances changing the same way are drawn by one active layer, the moving ones by one layer each.
+        """
+        colors = {} if colors is None else dict(colors)
+        anchors = {} if anchors is None else anchors
+        hide, show = set(hide), set(show)
+        groups = {}
+        for i in sorted(hide | show | set(colors) | set(anchors)):
+            kind = "hide" if i in hide else "show" if i in show else "keep"
+            color = self.palette[self.color_index[i]]
+            groups.setdefault((kind, color, colors.get(i, color), i if i in anchors else None), []).append(i)
+        self._build([(key[1], np.array(indices)) for key, indices in groups.items()])
+        self.visible[list(hide)] = False
+        self.visible[list(show)] = True
+        for i, color in colors.items():
+            self.color_index[i] = self._color_index(color)
+        if anchors:
+            moved = list(anchors)
+            self._write_anchors(moved, [anchors[i][0] for i in moved], [anchors[i][1] for i in moved])
+            geometry = self.geometry()
+        animations = []
+        for layer, (kind, _, color, moved) in zip(self.active, groups):
+            if moved is None:
+                if kind == "show":
+                    layer.set_opacity(0)
+                animations.append(layer.animate(**kwargs).set_color(color).set_opacity(0 if kind == "hide" else 1))
+            else:
+                target = self._layer(color)
+                self._set_layer(target, np.array([moved]), geometry)
+                if kind == "hide":
+                    target.set_opacity(0)
+                animations.append(Transform(layer, target, **kwargs))
+        return AnimationGroup(*animations)
+
+    def fade_out(self, indices, **kwargs):
+        return self.change(hide=indices, **kwargs)
+
+    def fade_in(self, indices, **kwargs):
+        return self.change(show=indices, **kwargs)
+
+    def recolor(self, indices, color, **kwargs):
+        return self.change(colors={i: color for i in indices}, **kwargs)
+
+    def indicate(self, indices, **kwargs):
+        # Indicate applied to each instance separately
+        self._build([(self.palette[self.color_index[i]], np.array([i])) for i in indices])
+        return AnimationGroup(*[Indicate(instance, **kwargs) for instance in self.active])
+
+
+class ArrowField(InstanceField):
+    """
+    Straight arrows, such as the edges of a tour, going from the start to the end of their anchors and laid out
+    as Arrow between two points.
+    """
+
+    def __init__(
+        self,
+        starts,
+        ends,
+        color=WHITE,
+        buff=MED_SMALL_BUFF,
+        tip_length=DEFAULT_ARROW_TIP_LENGTH,
+        stroke_width=6,
+        **kwargs
+    ):
+        self.buff = buff
+        self.tip_length = tip_length
+        self.arrow_stroke_width = stroke_width
+        super().__init__(starts, ends, color=color, **kwargs)
+
+    def _layer(self, color):
+        return VGroup(VMobject(stroke_color=color, stroke_width=self.arrow_stroke_width, fill_opacity=0),
+                      VMobject(fill_color=color, fill_opacity=1, stroke_width=0))
+
+    def _arrow_geometry(self):
+        scale = self.get_scale()
+        return _arrow_geometry(self.get_starts(), self.get_ends(), self.buff * scale, self.tip_length * scale)
+
+    def geometry(self, growth=None):
+        """
+        (line starts, line ends, tip corners) of every arrow, each arrow being scaled from its start by growth
+        if given
+        """
+        line_starts, line_ends, tips = self._arrow_geometry()
+        return (line_starts, *_grown_arrows(line_starts, line_ends, tips, growth))
+
+    def _set_layer(self, layer, selected, geometry):
+        line_starts, line_ends, tips = geometry
+        layer[0].set_points(_segment_points(line_starts[selected], line_ends[selected]).reshape(-1, 3))
+        layer[1].set_points(_polygon_points(tips[selected]))
+
+    def grow(self, order=None, lag_ratio=0, **kwargs):
+        return GrowArrowField(self, order=order, lag_ratio=lag_ratio, **kwargs)
+
+
+class DashedArrowField(ArrowField):
+    """
+    Straight dashed arrows, such as the candidate insertions of a sequence, laid out as the DashedArrow
+    of the slides.
+    """
+
+    def __init__(
+        self,
+        starts,
+        ends,
+        color=WHITE,
+        dash_length=DEFAULT_DASH_LENGTH,
+        dashed_ratio=0.5,
+        **kwargs
+    ):
+        self.dash_length = dash_length
+        self.dashed_ratio = dashed_ratio
+        super().__init__(starts, ends, color=color, **kwargs)
+
+    def geometry(self, growth=None):
+        """
+        (line starts, line ends, number of dashes, tip corners) of every arrow, the number of dashes
+        not changing with growth
+        """
+        line_starts, line_ends, tips = self._arrow_geometry()
+        line_length = np.linalg.norm(line_ends - line_starts, axis=1)
+        num_dashes = np.maximum(2, np.ceil(line_length / (self.dash_length * self.get_scale()) * self.dashed_ratio))
+        line_ends, tips = _grown_arrows(line_starts, line_ends, tips, growth)
+        return line_starts, line_ends, num_dashes.astype(int), tips
+
+    def _set_layer(self, layer, selected, geometry):
+        line_starts, line_ends, num_dashes, tips = geometry
+        layer[0].set_points(_dash_points(line_starts[selected], line_ends[selected], num_dashes[selected],
+                                         self.dashed_ratio))
+        layer[1].set_points(_polygon_points(tips[selected]))
+
+
+def _circle_points(num_curves=8):
+    # bezier points of a circle of radius 1 around the origin, made of num_curves arcs as Circle
+    angles = np.linspace(0, TAU, num_curves + 1)
+    kappa = 4 / 3 * np.tan(TAU / num_curves / 4)
+    anchors = np.stack([np.cos(angles), np.sin(angles), np.zeros(len(angles))], axis=1)
+    tangents = np.stack([-np.sin(angles), np.cos(angles), np.zeros(len(angles))], axis=1)
+    return np.stack([anchors[:-1], anchors[:-1] + kappa * tangents[:-1],
+                     anchors[1:] - kappa * tangents[1:], anchors[1:]], axis=1).reshape(-1, 3)
+
+
+class NodeLayer(InstanceField):
+    """
+    Nodes drawn as dots, such as the customers of an instance, with a color and a radius per node.
+    The start of the anchors of a node is its center, and their length its radius.
+    set_color takes the indices of the nodes to color, all of them by default.
+    """
+
+    circle = _circle_points()
+
+    def __init__(self, points, radius=DEFAULT_DOT_RADIUS, color=WHITE, **kwargs):
+        points = np.array(points, dtype=float).reshape(-1, 3)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), len(points))
+        super().__init__(points, points + radius[:, None] * RIGHT, color=color, **kwargs)
+
+    def _layer(self, color):
+        return VMobject(fill_color=color, fill_opacity=1, stroke_width=0)
+
+    def get_centers(self):
+        return self.get_starts()
+
+    def get_radii(self):
+        return np.linalg.norm(self.get_ends() - self.get_starts(), axis=1)
+
+    def geometry(self):
+        return self.get_centers(), self.get_radii()
+
+    def _set_layer(self, layer, selected, geometry):
+        centers, radii = geometry
+        layer.set_points((centers[selected][:, None] + radii[selected][:, None, None] * self.circle).reshape(-1, 3))
+
+    def set_color(self, color, family=True, indices=None):
+        return self.set_colors(range(self.num_instances) if indices is None else indices, color)
+
+    def set_radius(self, indices, radius):
+        centers = self.get_centers()[list(indices)]
+        return self.set_anchors(list(indices), centers, centers + np.asarray(radius) * RIGHT)
+
+    def get_node(self, index):
+        # standalone Dot at the place of a node, to position other mobjects
+        return Dot(self.get_centers()[index], radius=self.get_radii()[index],
+                   color=self.palette[self.color_index[index]])
+
+
+class GrowArrowField(Animation):
+    """
+    GrowArrow applied to the visible arrows of an ArrowField, one after the other in the given order with
+    the lag_ratio of an AnimationGroup, the geometry of all arrows being computed at once at each frame.
+    The arrows missing from the order keep their full length.
+    """
+
+    def __init__(self, field, order=None, lag_ratio=0, **kwargs):
+        order = np.arange(field.num_instances) if order is None else np.asarray(order, dtype=int)
+        self.starts = np.full(field.num_instances, -np.inf)
+        self.starts[order] = np.arange(len(order)) * lag_ratio
+        self.total = (len(order) - 1) * lag_ratio + 1 if len(order) else 1
+        super().__init__(field, **kwargs)
+
+    def interpolate_mobject(self, alpha):
+        progress = np.clip(alpha * self.total - self.starts, 0, 1)
+        self.mobject._build(growth=[self.rate_func(p) for p in progress])
+
+
+class Tour(VGroup):
+    """
+    Routes visiting nodes, such as a solution of a benchmark instance, drawn as VRPIntro draws its orderings:
+    the nodes are a NodeLayer and all the edges a single ArrowField, the edges of each route (one per vehicle)
+    having the color of the route. Each route goes back to its first node if closed is set.
+
+    The points are fitted in a box of the given width and height, centered on the origin, before the nodes
+    and the arrows are sized.
+    """
+
+    def __init__(
+        self,
+        points,
+        routes,
+        colors=(BLUE,),
+        closed=True,
+        width=12,
+        height=6,
+        radius=0.05,
+        node_color=WHITE,
+        buff=None,
+        tip_length=0.1,
+        stroke_width=2,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        points = np.array(points, dtype=float).reshape(-1, 3)
+        low, high = points.min(axis=0), points.max(axis=0)
+        size = np.maximum(high - low, 1e-9)
+        points = (points - (low + high) / 2) * min(width / size[0], height / size[1])
+        # a single order is a route on its own
+        if len(routes) and np.ndim(routes[0]) == 0:
+            routes = [routes]
+        self.routes = [np.asarray(route, dtype=int) for route in routes]
+        edges = [np.stack([route, np.roll(route, -1)], axis=1)[:len(route) - (not closed)]
+                 for route in self.routes]
+        self.edge_route = np.repeat(np.arange(len(edges)), [len(e) for e in edges])
+        self.edge_nodes = np.concatenate(edges) if edges else np.zeros((0, 2), dtype=int)
+        self.nodes = NodeLayer(points, radius=radius, color=node_color)
+        self.edges = ArrowField(points[self.edge_nodes[:, 0]], points[self.edge_nodes[:, 1]],
+                                color=[colors[r % len(colors)] for r in self.edge_route],
+                                buff=radius if buff is None else buff, tip_length=tip_length,
+                                stroke_width=stroke_width)
+        self.grown = np.zeros(len(self.routes), dtype=bool)
+        self.add(self.edges, self.nodes)
+
+    def route_edges(self, route):
+        # indices in edges of the edges of a route, in the order of the route
+        return np.flatnonzero(self.edge_route == route)
+
+    def grow(self, routes=None, lag_ratio=0, **kwargs):
+        """
+        the edges of the routes (all by default) grow one after the other along the routes, the edges of the
+        routes which have not been grown yet being hidden
+        """
+        routes = range(len(self.routes)) if routes is None else routes
+        self.grown[list(routes)] = True
+        self.edges.visible[:] = self.grown[self.edge_route]
+        order = np.concatenate([self.route_edges(route) for route in routes])
+        return self.edges.grow(order=order, lag_ratio=lag_ratio, **kwargs)
+
+
+class SequenceDiagram(VGroup):
+    """
+    Drawing of the state of a SequenceVar, as in the slides Sequences and TransitionTime: the nodes colored by
+    their state (member, possible or excluded), the successors of the members as arrows and the insertions
+    (pred, node) of the possible nodes as dashed arrows.
+
+    The insertions which can be drawn are the given pairs, the insertions of the sequence by default. animate_to returns
+    the animation from the drawn state to the state of a sequence: only the nodes changing of state are recolored,
+    only the insertions appearing or disappearing fade, and only the successors changing are rerouted, grown from
+    their node or faded out.
+    """
+
+    def __init__(
+        self,
+        sequence,
+        points,
+        pairs=None,
+        radius=0.16,
+        state_colors=(MEMBER, POSSIBLE, EXCLUDED),
+        insertion_color=WHITE,
+        dash_length=0.15,
+        dashed_ratio=0.4,
+        **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.state_colors = state_colors
+        self.insertion_color = insertion_color
+        if pairs is None:
+            pairs = sorted(sequence.get_insert_pairs(), key=lambda pair: pair[::-1])
+        self.pairs = [tuple(pair) for pair in pairs]
+        self.pair_index = {pair: i for i, pair in enumerate(self.pairs)}
+        points = np.array(points, dtype=float).reshape(-1, 3)
+        self.nodes = NodeLayer(points, radius=radius,
+                               color=[self.node_color(sequence, node) for node in range(len(points))])
+        # one successor arrow per node, from the node to its successor, degenerated on the node when not drawn
+        self.succ_drawn = np.array([self._successor(sequence, node) for node in range(len(points))])
+        drawn = self.succ_drawn >= 0
+        self.successors = ArrowField(points, points[np.where(drawn, self.succ_drawn, np.arange(len(points)))],
+                                     color=state_colors[0])
+        self.successors.hide(np.flatnonzero(~drawn))
+        pairs = np.array(self.pairs, dtype=int).reshape(-1, 2)
+        self.insertions = DashedArrowField(points[pairs[:, 0]], points[pairs[:, 1]], color=insertion_color,
+                                           dash_length=dash_length, dashed_ratio=dashed_ratio)
+        self.add(self.nodes, self.successors, self.insertions)
+
+    def node_color(self, sequence, node):
+        # color of a node given by its state in the sequence
+        if sequence.is_member(node):
+            return self.state_colors[0]
+        return self.state_colors[1] if sequence.is_possible(node) else self.state_colors[2]
+
+    @staticmethod
+    def _successor(sequence, node):
+        # successor drawn from node, -1 if none
+        return sequence.succ(node) if sequence.is_member(node) and node != sequence.last else -1
+
+    def animate_to(self, sequence, **kwargs):
+        """
+        one animation from the drawn state to the state of the sequence, changing only what differs between them
+        """
+        nodes = self.nodes
+        colors = {node: self.node_color(sequence, node) for node in range(nodes.num_instances)}
+        colors = {node: color for node, color in colors.items()
+                  if nodes.palette[nodes.color_index[node]] != color}
+        insert_pairs = sequence.get_insert_pairs()
+        target = np.array([pair in insert_pairs for pair in self.pairs], dtype=bool)
+        shown = np.flatnonzero(target & ~self.insertions.visible)
+        hidden = np.flatnonzero(~target & self.insertions.visible)
+        # the arrows fading in get back the color of the insertions, if they were highlighted before
+        insertion_colors = {i: self.insertion_color for i in shown
+                            if self.insertions.palette[self.insertions.color_index[i]] != self.insertion_color}
+        succ = np.array([self._successor(sequence, node) for node in range(nodes.num_instances)])
+        changed = np.flatnonzero(succ != self.succ_drawn)
+        centers = nodes.get_centers()
+        grown = [node for node in changed if self.succ_drawn[node] < 0]
+        # a new successor grows from its node
+        if grown:
+            self.successors._write_anchors(grown, centers[grown], centers[grown])
+        anchors = {node: (centers[node], centers[succ[node]]) for node in changed if succ[node] >= 0}
+        animations = [
+            nodes.change(colors=colors, **kwargs),
+            self.insertions.change(hide=hidden, show=shown, colors=insertion_colors, **kwargs),
+            self.successors.change(hide=[node for node in changed if succ[node] < 0], show=grown, anchors=anchors,
+                                   **kwargs),
+        ]
+        self.succ_drawn = succ
+        return AnimationGroup(*animations)
+
+
+class InsertionTable(GrowingTable):
+    """
+    Table of the insertions of the nodes of a SequenceVar, as in the slide Sequences: one row per node, with its
+    name colored by its state, its insertions I^x, each colored by the state of its node, n_s^x and n_p^x.
+
+    Only the rows of the given nodes and the first columns are drawn, show adding rows and columns. The cells are
+    typeset from the state of the sequence: animate_to compares the state drawn with the one of a sequence,
+    with numpy over all the nodes, and only rebuilds the cells whose value changed, n_s^x and n_p^x being read from
+    the counters of the sequence.
+    """
+
+    def __init__(
+        self,
+        sequence,
+        names,
+        header,
+        nodes,
+        columns=4,
+        state_colors=(MEMBER, POSSIBLE, EXCLUDED),
+        **kwargs
+    ):
+        self.names = names
+        self.header = list(header)
+        self.nodes = list(nodes)
+        self.num_columns = columns
+        self.state_colors = state_colors
+        self._read(sequence)
+        super().__init__([self.header[:columns]] + [self._row(node) for node in self.nodes], **kwargs)
+
+    def _read(self, sequence):
+        # state drawn by the cells
+        self.states = sequence.get_states()
+        self.inserts = sequence.get_insert_matrix()
+        self.n_member = sequence.n_member_inserts_array.copy()
+        self.n_possible = sequence.n_possible_inserts_array.copy()
+
+    def _cell(self, node, column):
+        if column == 0:
+            return cached_tex(f"${self.names[node]}$", color=self.state_colors[self.states[node]])
+        if column == 1:
+            preds = np.flatnonzero(self.inserts[node])
+            if not len(preds):
+                return cached_tex(r"$\emptyset$")
+            strings = [string for pred in preds for string in [",", self.names[pred]]]
+            cell = cached_math_tex(r"\{", *strings[1:], r"\}")
+            for k, pred in enumerate(preds):
+                cell[1 + 2 * k].set_color(self.state_colors[self.states[pred]])
+            return cell
+        if column == 2:
+            return cached_tex(str(self.n_member[node]), color=self.state_colors[0])
+        return cached_tex(str(self.n_possible[node]), color=self.state_colors[1])
+
+    def _row(self, node):
+        return [self._cell(node, column) for column in range(self.num_columns)]
+
+    def show(self, nodes=(), columns=None, **kwargs):
+        # animation adding the rows of the nodes, then the columns up to the given number
+        columns = self.num_columns if columns is None else columns
+        new_columns = [[self.header[column]] + [self._cell(node, column) for node in self.nodes]
+                       for column in range(self.num_columns, columns)]
+        self.num_columns = columns
+        self.nodes += list(nodes)
+        return self.grow(rows=[self._row(node) for node in nodes], columns=new_columns, **kwargs)
+
+    def changes(self, sequence):
+        """
+        (row, column) of the cells whose value differs between the state drawn and the one of the sequence, (1, 1)
+        being the top left cell of the header; the state drawn becomes the one of the sequence
+        """
+        states, inserts, n_member, n_possible = self.states, self.inserts, self.n_member, self.n_possible
+        self._read(sequence)
+        nodes = np.array(self.nodes, dtype=int)
+        moved = self.states != states
+        changed = [
+            moved[nodes],
+            # the insertions change of color with the state of their node
+            (self.inserts[nodes] != inserts[nodes]).any(axis=1) | (self.inserts[nodes] & moved).any(axis=1),
+            self.n_member[nodes] != n_member[nodes],
+            self.n_possible[nodes] != n_possible[nodes],
+        ]
+        return [(row + 2, column + 1) for column in range(self.num_columns) for row in np.flatnonzero(changed[column])]
+
+    def animate_to(self, sequence, **kwargs):
+        # animation of the cells changing to the state of the sequence
+        cells = {(row, column): self._cell(self.nodes[row - 2], column - 1)
+                 for row, column in self.changes(sequence)}
+        return self.set_cells(cells, **kwargs)
+
+
+class SuccessorTable(GrowingTable):
+    """
+    Array of the successors of the nodes of a SequenceVar, as in the slide Sequences: the name of each node
+    above the name of its successor, the columns of the members being highlighted. animate_to only rebuilds
+    the successors which changed and the highlights of the nodes changing of state, all the highlights being
+    placed again only when the columns change of size.
+    """
+
+    def __init__(
+        self,
+        sequence,
+        names,
+        nodes=None,
+        header=("node", "succ"),
+        color=MEMBER,
+        h_buff=0.2,
+        v_buff=0.1,
+        **kwargs
+    ):
+        self.names = names
+        self.nodes = list(range(len(names))) if nodes is None else list(nodes)
+        self.color = color
+        self.succ = sequence.succ_array.copy()
+        self.members = sequence.get_states() == 0
+        self.changed_columns = []
+        self.highlight_targets = {}
+        super().__init__([[cached_math_tex(header[0])] + [cached_math_tex(names[node]) for node in self.nodes],
+                          [cached_math_tex(header[1])] + [self._successor(node) for node in self.nodes]],
+                         h_buff=h_buff, v_buff=v_buff, **kwargs)
+        self.highlights = self._highlights()
+        self.add_to_back(self.highlights)
+
+    def _successor(self, node):
+        return cached_math_tex(self.names[self.succ[node]])
+
+    def _highlight(self, column):
+        # rectangle behind a column, transparent if its node is not a member
+        top, bottom = self.get_cell((1, column + 2)), self.get_cell((2, column + 2))
+        return Polygon(top.get_corner(UL), top.get_corner(UR), bottom.get_corner(DR), bottom.get_corner(DL),
+                       stroke_width=0, fill_color=self.color,
+                       fill_opacity=0.75 if self.members[self.nodes[column]] else 0)
+
+    def _highlights(self):
+        return VGroup(*[self._highlight(column) for column in range(len(self.nodes))])
+
+    def _line_places(self):
+        return np.array([line.get_start_and_end() for line in [*self.horizontal_lines, *self.vertical_lines]])
+
+    def _arrange(self, corner):
+        before = self._line_places()
+        super()._arrange(corner)
+        after = self._line_places()
+        # targets of the highlights reached by animate_to: all of them if the columns moved, else only the ones
+        # of the columns changing of state; none for the first layout, __init__ building the highlights
+        moved = len(before) and (before.shape != after.shape or not np.allclose(before, after))
+        columns = range(len(self.nodes)) if moved else self.changed_columns
+        self.highlight_targets = {column: self._highlight(column) for column in columns}
+
+    def animate_to(self, sequence, **kwargs):
+        # animation of the successors and of the highlights changing to the state of the sequence
+        succ, members = sequence.succ_array, sequence.get_states() == 0
+        nodes = np.array(self.nodes, dtype=int)
+        changed = np.flatnonzero(succ[nodes] != self.succ[nodes])
+        self.changed_columns = np.flatnonzero(members[nodes] != self.members[nodes])
+        self.succ, self.members = succ.copy(), members
+        animation = self.set_cells({(2, column + 2): self._successor(nodes[column]) for column in changed}, **kwargs)
+        animations = [Transform(self.highlights[column], target, **kwargs)
+                      for column, target in self.highlight_targets.items()]
+        return AnimationGroup(animation, *animations)
@@ -1,8 +1,13 @@
 import numpy as np
 from manim import *
 from manim_presentation import Slide
+from new_geometry import InsertionTable, SequenceDiagram, SparseMathTable, SparseMobjectTable, SuccessorTable, \
+    TimeWindowBars
+from sequence_var import SequenceVar
+from utils import cached_math_tex, cached_tex
 import re
 import random
+import time_windows
 
 MEMBER = GREEN
 POSSIBLE = BLUE
@@ -130,23 +135,10 @@ class Presentation(Slide):
             [60, 99],
         ]
         # a time window is simply a red rectangle for the invalid time, a green for the valid time and a red again
-        tw_animation_list = []
-        tw_group_list = []
-        height = 0.1
-        for i, dot in enumerate(dots):
-            tw = tws[i]
-            lengths = ([0] + tw + [99])
-            l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-            before = Rectangle(color=RED, fill_opacity=1, width=l[0], height=height, stroke_width=0)
-            during = Rectangle(color=GREEN, fill_opacity=1, width=l[1], height=height, stroke_width=0)
-            after = Rectangle(color=RED, fill_opacity=1, width=l[2], height=height, stroke_width=0)
-            group = VGroup(before, during, after).arrange(RIGHT, buff=0).next_to(dot, UP)
-            tw_group_list.append(group)
-            animation = GrowFromPoint(group, dot)
-            tw_animation_list.append(animation)
-        self.play(AnimationGroup(*tw_animation_list))
-        self.pause()
-        self.play(AnimationGroup(*[ShrinkToCenter(tw) for tw in tw_group_list]))
+        tw_bars = TimeWindowBars(tws, dots)
+        self.play(tw_bars.grow())
+        self.pause()
+        self.play(tw_bars.shrink())
         self.pause()
 
         # transform the nodes into arrows pointing upwards or downwards, if pickup or drop
@@ -386,22 +378,15 @@ class Presentation(Slide):
 
         text_sequence = Text("Sequence Variable", color=BLUE).to_corner(UP + LEFT)
         text_data_structure = Text("data structures", color=BLUE).next_to(text_sequence, RIGHT).to_corner(UP)
-        insert_table = MathTable(
+        insert_table = SparseMathTable(
             [["Partial Sequence", "Operation"],
              [r"\alpha \rightarrow \omega", "Initialization"],
              [r"\alpha \rightarrow 1 \rightarrow \omega", r"Insert(\alpha, 1)"],
              [r"\alpha \rightarrow 1 \rightarrow 4 \rightarrow \omega", r"Insert(1, 4)"],
              [r"\alpha \rightarrow 5 \rightarrow 1 \rightarrow 4 \rightarrow \omega", r"Insert(\alpha, 5)"]
              ],
-            include_outer_lines=False).next_to(text_sequence, DOWN, buff=TITLE_BUF).set_x(ORIGIN[0])
-        for i, o in enumerate(insert_table.get_horizontal_lines()):
-            if i == 0:
-                o.set_color(BLUE)
-            else:
-                insert_table.remove(o)
-
-        for i, o in enumerate(insert_table.get_vertical_lines()):
-            o.set_color(BLUE)
+            include_outer_lines=False, h_lines=[0], line_config={"color": BLUE})\
+            .next_to(text_sequence, DOWN, buff=TITLE_BUF).set_x(ORIGIN[0])
 
         # coordinates for the dots
         coords = [
@@ -416,47 +401,37 @@ class Presentation(Slide):
             np.array([2.5, -2, 0]),
             np.array([3.5, 1.5, 0]),
         ]
-        # draw the dots
-        dots = [Dot(i, radius=0.16) for i in coords]
+        # state of the sequence variable: alpha -> a -> b -> c -> omega, with a few insertions for the possible nodes
+        sequence = SequenceVar(len(coords), first=0, last=4)
+        for pred, node in [(0, 1), (1, 2), (2, 3)]:
+            sequence.insert(pred, node)
+        for node in [8, 9]:
+            sequence.exclude(node)
+        for node, preds in {5: [0, 1, 2, 3], 6: [1, 2, 3, 5], 7: [2, 3, 5, 6]}.items():
+            sequence.keep_inserts(node, preds)
         # partition of the nodes
-        members = [0, 1, 2, 3, 4]
-        possible = [5, 6, 7]
-        insertions = {
-            5: [0, 1, 2, 3],
-            6: [1, 2, 3, 5],
-            7: [2, 3, 5, 6],
-        }
-        excluded = [8, 9]
-
-        members_group = VGroup(*[dots[i] for i in members])
-        excluded_group = VGroup(*[dots[i] for i in excluded])
-        possible_group = VGroup(*[dots[i] for i in possible])
-        text_first = Tex(r"$\alpha$", color=MEMBER).next_to(dots[0], LEFT, buff=0.1)
-        text_last = Tex(r"$\omega$", color=MEMBER).next_to(dots[4], LEFT, buff=0.1)
+        members = sequence.get_members()
+        possible = sorted(sequence.get_possible().tolist())
+        insertions = {node: sorted(sequence.get_inserts(node).tolist()) for node in possible}
+        excluded = sorted(sequence.get_excluded().tolist())
+        # the dots, the successors and the insertions drawn from the state, the dots being colored along the slide
+        diagram = SequenceDiagram(sequence, coords, state_colors=(MEMBER, POSSIBLE, EXCLUDED), insertion_color=FG)
+        nodes = diagram.nodes
+        nodes.set_color(FG)
+
+        text_first = Tex(r"$\alpha$", color=MEMBER).next_to(nodes.get_node(0), LEFT, buff=0.1)
+        text_last = Tex(r"$\omega$", color=MEMBER).next_to(nodes.get_node(4), LEFT, buff=0.1)
         text_member = Text("members (S)", color=MEMBER).scale(0.5)
         text_possible = Text("possible (P)", color=POSSIBLE).scale(0.5)
         text_excluded = Text("excluded (E)", color=EXCLUDED).scale(0.5)
-        all_dots = VGroup(*dots).next_to(text_sequence, DOWN, buff=.5).set_x(ORIGIN[0])
-        description_group = VGroup(text_member, text_possible, text_excluded).arrange(RIGHT, buff=1).next_to(all_dots,
+        diagram.next_to(text_sequence, DOWN, buff=.5).set_x(ORIGIN[0])
+        description_group = VGroup(text_member, text_possible, text_excluded).arrange(RIGHT, buff=1).next_to(nodes,
                                                                                                              DOWN)
+        arrow_index = diagram.pair_index
 
-        # ordering for the members
-        successors = [Arrow(i.get_center(), j.get_center(), color=MEMBER) for i, j in
-                      zip(members_group, members_group[1:])]
-        # successors_group = VGroup(*successors)
-        animations = [GrowArrow(succ) for succ in successors]
-
-        # predecessors for the nodes
-        insertions_arrows = {
-            node:
-                [DashedArrow(start=dots[pred].get_center(), end=dots[node].get_center(), dashed_ratio=0.4,
-                             dash_length=0.15, color=FG) for pred in v]
-            for node, v in insertions.items()
-        }
         # make the arrows grow
-        arrows_list = [arrow for k, v in insertions_arrows.items() for arrow in v]
-        random.shuffle(arrows_list)
-        grow_insertions = [GrowArrow(arrow) for arrow in arrows_list]
+        arrows_order = list(range(len(diagram.pairs)))
+        random.shuffle(arrows_order)
 
         # initial title, table of operations
         self.play(FadeIn(text_contribution))
@@ -468,67 +443,56 @@ class Presentation(Slide):
         self.pause()
         self.play(FadeOut(insert_table))
         # and the dots appear
-        self.play(*[FadeIn(dot) for dot in dots])
+        self.play(FadeIn(nodes))
         self.pause()
         # simply shows the text first and last node, arrows between them and explains nothing else
-        temporary_arrow = Arrow(dots[0], dots[4], color=MEMBER)
-        self.play(AnimationGroup(*[dots[i].animate.set_color(MEMBER) for i in [0, 4]]))
+        temporary_arrow = Arrow(nodes.get_node(0), nodes.get_node(4), color=MEMBER)
+        self.play(nodes.recolor([0, 4], MEMBER))
         self.play(AnimationGroup(*[FadeIn(text_first), FadeIn(text_last), GrowArrow(temporary_arrow)], lag_ratio=0.2))
         self.pause()
         self.play(FadeOut(temporary_arrow))
         # nodes that will be set as members
-        self.play(members_group.animate.set_color(MEMBER))
+        self.play(nodes.recolor(members, MEMBER))
         #self.play(AnimationGroup(*[FadeIn(text_first), FadeIn(text_last), FadeIn(text_member)]))
         self.play(FadeIn(text_member))
         self.pause()
-        self.play(AnimationGroup(*animations, lag_ratio=0.25))
+        self.play(diagram.successors.grow(order=members[:-1], lag_ratio=0.25))
         self.pause()
         # excluded nodes
-        self.play(excluded_group.animate.set_color(EXCLUDED))
+        self.play(nodes.recolor(excluded, EXCLUDED))
         self.play(FadeIn(text_excluded))
         self.pause()
         # possible nodes
-        self.play(possible_group.animate.set_color(POSSIBLE))
+        self.play(nodes.recolor(possible, POSSIBLE))
         self.play(FadeIn(text_possible))
         self.pause()
         # show the insertions
-        self.play(AnimationGroup(*grow_insertions, lag_ratio=0.2))
+        self.play(diagram.insertions.grow(order=arrows_order, lag_ratio=0.2))
         self.pause()
-        # show an exclusion of a possible node (node 5)
+        # show an exclusion of a possible node (node 5), done on the sequence variable and undone by restoring it
         n = 5
-        self.play(Indicate(dots[n], color=EXCLUDED))
+        self.play(nodes.indicate([n], color=EXCLUDED))
         self.wait()
-        arrows_changed = [insertions_arrows[node][i] for node, v in insertions.items() for i, pred in enumerate(v) if
-                          pred == n or node == n]
-        self.play(dots[n].animate.set_color(EXCLUDED))
-        self.play(AnimationGroup(*([FadeOut(arrow) for arrow in arrows_changed])))
+        sequence.save_state()
+        sequence.exclude(n)
+        self.play(diagram.animate_to(sequence))
         self.pause()
-        # revert to previous state
-        self.play(AnimationGroup(*([FadeIn(arrow) for arrow in arrows_changed])))
-        self.play(dots[n].animate.set_color(POSSIBLE))
+        # revert to previous state: only the arrows of the insertions restored are drawn again
+        sequence.restore_state()
+        self.play(diagram.animate_to(sequence))
         self.pause()
         # show the insertion of a possible node (node 5 after node 1)
         p = 1
-        arrows_changed = [insertions_arrows[n][i] for i, pred in enumerate(insertions[n]) if pred != p]
-        arrow_selected = [arrow for arrow in insertions_arrows[n] if arrow not in arrows_changed][0]
-        arrow_detour_added = Arrow(start=dots[n], end=dots[2], color=MEMBER)
-        arrow_detour_removed = successors[1]
-        self.play(Indicate(dots[n], color=MEMBER))
+        self.play(nodes.indicate([n], color=MEMBER))
         self.wait()
-        self.play(dots[n].animate.set_color(MEMBER))
-        self.play(AnimationGroup(*[FadeOut(arrow) for arrow in arrows_changed]))
-        # change the arrow for the insertion
-        arrow_selected.save_state()
-        arrow_detour_removed.save_state()
-        self.play(AnimationGroup(*[
-            Transform(arrow_selected, Arrow(start=dots[p], end=dots[n], color=MEMBER)),
-            FadeOut(arrow_detour_removed),
-            GrowArrow(arrow_detour_added)
-        ]))
+        sequence.save_state()
+        sequence.insert(p, n)
+        # the successor of p is rerouted to n, the successor of n grows and the insertions of n are removed
+        self.play(diagram.animate_to(sequence))
         self.pause()
         # undo the insertion
-        self.play(AnimationGroup(*[Restore(arrow_selected), Restore(arrow_detour_removed), FadeOut(arrow_detour_added),
-                                   dots[n].animate.set_color(POSSIBLE)]))
+        sequence.restore_state()
+        self.play(diagram.animate_to(sequence))
         self.pause()
         self.wait()
 
@@ -536,19 +500,18 @@ class Presentation(Slide):
         # unzoom the sequence to make place for the data structures
         nodes_labels = [
             text_first,
-            Tex(r"$a$", color=MEMBER).next_to(dots[1], LEFT),
-            Tex(r"$b$", color=MEMBER).next_to(dots[2], LEFT),
-            Tex(r"$c$", color=MEMBER).next_to(dots[3], LEFT),
+            Tex(r"$a$", color=MEMBER).next_to(nodes.get_node(1), LEFT),
+            Tex(r"$b$", color=MEMBER).next_to(nodes.get_node(2), LEFT),
+            Tex(r"$c$", color=MEMBER).next_to(nodes.get_node(3), LEFT),
             text_last,
-            Tex(r"$d$", color=POSSIBLE).next_to(dots[5], RIGHT),
-            Tex(r"$e$", color=POSSIBLE).next_to(dots[6], RIGHT),
-            Tex(r"$f$", color=POSSIBLE).next_to(dots[7], RIGHT),
-            Tex(r"$g$", color=EXCLUDED).next_to(dots[8], RIGHT),
-            Tex(r"$h$", color=EXCLUDED).next_to(dots[9], RIGHT),
+            Tex(r"$d$", color=POSSIBLE).next_to(nodes.get_node(5), RIGHT),
+            Tex(r"$e$", color=POSSIBLE).next_to(nodes.get_node(6), RIGHT),
+            Tex(r"$f$", color=POSSIBLE).next_to(nodes.get_node(7), RIGHT),
+            Tex(r"$g$", color=EXCLUDED).next_to(nodes.get_node(8), RIGHT),
+            Tex(r"$h$", color=EXCLUDED).next_to(nodes.get_node(9), RIGHT),
         ]
         labels_group = VGroup(*nodes_labels)
-        full_schema = VGroup(all_dots, *[arrow for n, v in insertions_arrows.items() for arrow in v],
-                             description_group, *successors, labels_group)
+        full_schema = VGroup(diagram, description_group, labels_group)
         self.play(ScaleInPlace(full_schema, 0.8))
         self.play(AnimationGroup(*[full_schema.animate.to_corner(LEFT), FadeIn(text_data_structure)]))
         self.pause()
@@ -561,107 +524,45 @@ class Presentation(Slide):
         header_buff = 0.4
         table_header_tiny = VGroup(text_node, text_insert).arrange(RIGHT, buff=header_buff)
         table_header_full = VGroup(table_header_tiny, text_nsx, text_npx).arrange(RIGHT, buff=header_buff)
-        table_label = [
-            Tex("$a$", color=MEMBER),
-            Tex("$b$", color=MEMBER),
-            Tex("$c$", color=MEMBER),
-            Tex("$d$", color=POSSIBLE),
-            Tex("$e$", color=POSSIBLE),
-            Tex("$f$", color=POSSIBLE),
-            Tex("$g$", color=EXCLUDED),
-            Tex("$h$", color=EXCLUDED),
-        ]
-        table_insertions = [
-            Tex("$\emptyset$"),
-            Tex("$\emptyset$"),
-            Tex("$\emptyset$"),
-            MathTex(r"\{ {{ \alpha }}, {{ a }} , {{ b }} , {{ c }} \}"),
-            MathTex("\{ {{ a }} , {{ b }} , {{ c }} , {{ d }} \}"),
-            MathTex("\{ {{ b }} , {{ c }} , {{ d }} , {{ e }} \}"),
-            Tex("$\emptyset$"),
-            Tex("$\emptyset$"),
-        ]
-        table_nsx = [
-            Tex("0", color=MEMBER),
-            Tex("0", color=MEMBER),
-            Tex("0", color=MEMBER),
-            Tex("4", color=MEMBER),
-            Tex("3", color=MEMBER),
-            Tex("2", color=MEMBER),
-            Tex("0", color=MEMBER),
-            Tex("0", color=MEMBER),
-        ]
-        table_npx = [
-            Tex("0", color=POSSIBLE),
-            Tex("0", color=POSSIBLE),
-            Tex("0", color=POSSIBLE),
-            Tex("0", color=POSSIBLE),
-            Tex("1", color=POSSIBLE),
-            Tex("2", color=POSSIBLE),
-            Tex("0", color=POSSIBLE),
-            Tex("0", color=POSSIBLE),
-        ]
-        for c in [r'\alpha', 'a', 'b', 'c']:
-            table_insertions[3].set_color_by_tex(c, MEMBER)
-        for c in ['a', 'b', 'c']:
-            table_insertions[4].set_color_by_tex(c, MEMBER)
-        for c in ['d']:
-            table_insertions[4].set_color_by_tex(c, POSSIBLE)
-        for c in ['b', 'c']:
-            table_insertions[5].set_color_by_tex(c, MEMBER)
-        for c in ['d', 'e']:
-            table_insertions[5].set_color_by_tex(c, POSSIBLE)
-
+        # names of the nodes, the cells of the table being typeset from the state of the sequence
+        names = [r"\alpha", "a", "b", "c", r"\omega", "d", "e", "f", "g", "h"]
         table_shift = np.array([8, -1, 0])
-        t0 = MobjectTable([
-            [text_node.copy(), text_insert.copy()],
-            *[[table_label[i].copy(), table_insertions[i].copy()] for i in range(3)]
-        ], v_buff=0.1, h_buff=0.2).to_corner(UP + LEFT).shift(table_shift)
-        t0.remove(*[o for i, o in enumerate(t0.get_vertical_lines()) if i != 0])
-        t0.remove(*[o for i, o in enumerate(t0.get_horizontal_lines()) if i != 0])
-        t1, t2 = [MobjectTable([
-            [text_node.copy(), text_insert.copy(), text_nsx.copy(), text_npx.copy()],
-            *[[table_label[i].copy(), table_insertions[i].copy(), table_nsx[i].copy(), table_npx[i].copy()] for i in
-              range(j)]
-        ], v_buff=0.1, h_buff=0.2).to_corner(UP + LEFT).shift(table_shift) for j in [6, len(table_npx)]]
-        for t in t1, t2:
-            t.remove(*[o for i, o in enumerate(t.get_vertical_lines()) if i != 0])
-            t.remove(*[o for i, o in enumerate(t.get_horizontal_lines()) if i != 0]) \
-                # self.play(AnimationGroup(*[FadeIn(text_node), FadeIn(text_insert), GrowFromPoint(header_line_tiny, header_line_tiny.get_start())]))
-        self.play(Create(t0))
+        # the table grows with the explanations, each cell being built once
+        table = InsertionTable(sequence, names, [text_node, text_insert, text_nsx, text_npx], nodes=[1, 2, 3],
+                               columns=2, state_colors=(MEMBER, POSSIBLE, EXCLUDED), v_buff=0.1, h_buff=0.2,
+                               h_lines=[0], v_lines=[0]).to_corner(UP + LEFT).shift(table_shift)
+        # self.play(AnimationGroup(*[FadeIn(text_node), FadeIn(text_insert), GrowFromPoint(header_line_tiny, header_line_tiny.get_start())]))
+        self.play(Create(table))
         self.wait()
         self.pause()
-        self.play(Transform(t0, t1))
+        self.play(table.show(nodes=[5, 6, 7], columns=4))
         self.wait()
         self.pause()
         # show insertions for node 6
-        surrounding_rectangle_node_6 = SurroundingRectangle(dots[6])
+        surrounding_rectangle_node_6 = SurroundingRectangle(nodes.get_node(6))
         self.play(Create(surrounding_rectangle_node_6))
         # show member insertions
-        self.play(AnimationGroup(
-            *[Indicate(insertions_arrows[6][j], color=MEMBER, run_time=2) for j, pred in enumerate(insertions[6]) if
-              pred in members]))
-        surrounding_rectangle_1 = SurroundingRectangle(t2.get_cell((6, 3)), buff=0)
+        self.play(diagram.insertions.indicate([arrow_index[pred, 6] for pred in insertions[6] if pred in members],
+                                              color=MEMBER, run_time=2))
+        surrounding_rectangle_1 = SurroundingRectangle(table.get_cell((6, 3)), buff=0)
         self.play(Create(surrounding_rectangle_1))
         self.wait()
         self.pause()
         self.play(FadeOut(surrounding_rectangle_1))
 
         # show possible insertions
-        self.play(AnimationGroup(
-            *[Indicate(insertions_arrows[6][j], color=POSSIBLE) for j, pred in enumerate(insertions[6]) if
-              pred in possible]))
-        surrounding_rectangle_2 = SurroundingRectangle(t2.get_cell((6, 4)), buff=0)
+        self.play(diagram.insertions.indicate([arrow_index[pred, 6] for pred in insertions[6] if pred in possible],
+                                              color=POSSIBLE))
+        surrounding_rectangle_2 = SurroundingRectangle(table.get_cell((6, 4)), buff=0)
         self.play(Create(surrounding_rectangle_2))
         self.wait()
         self.pause()
         self.play(AnimationGroup(*[Uncreate(surrounding_rectangle_node_6), FadeOut(surrounding_rectangle_2)]))
-        self.play(FadeIn(t2))
-        self.play(FadeOut(t1))
+        self.play(table.show(nodes=[8, 9]))
         self.pause()
 
-        for i, (item, description) in enumerate([(t2.get_columns()[1], "sparse sets"),
-                                                 (t2.get_columns()[2:4], "reversible\nintegers")]):
+        for i, (item, description) in enumerate([(table.get_columns()[1], "sparse sets"),
+                                                 (table.get_columns()[2:4], "reversible\nintegers")]):
             highlight = SurroundingRectangle(item)
             text_description = Text(description, color=highlight.color).scale(0.5).next_to(highlight, DOWN)
             self.play(Create(highlight, lag_ratio=2))
@@ -674,29 +575,29 @@ class Presentation(Slide):
 
         self.wait()
         # show successor array
-        succ_array = MobjectTable([[MathTex("node"), MathTex("a"), MathTex("b"), MathTex("c"), MathTex("d"),
-                                    MathTex("e"), MathTex("f"), MathTex("g"), MathTex("h"), MathTex(r"\alpha"), MathTex(r"\omega")],
-                                   [MathTex("succ"), MathTex("b"), MathTex("c"), MathTex(r"\omega"), MathTex("d"),
-                                    MathTex("e"), MathTex("f"), MathTex("g"), MathTex("h"), MathTex("a"), MathTex(r"\alpha")]
-                                   ], h_buff=0.2, include_outer_lines=False).next_to(t2, DOWN)
-        #succ_array = Table([['node', 'a', 'b', 'c', 'd', 'e', 'f', 'g', 'h', 'alpha', 'omega'],
-        #                           ], h_buff=0.2, include_outer_lines=False).next_to(t2, DOWN)
-        succ_array = MathTable([["node"] + [c for c in "abcdefgh"] + [r"\alpha", r"\omega"],
-                                ["succ", "b", "c", r"\omega", "d", "e", "f", "g", "h", "a", r"\alpha"]],
-                               h_buff=0.2, v_buff=0.1, include_outer_lines=False).next_to(t2, DOWN)
-        for node in [0, 1, 2, 8, 9]:
-            succ_array.add_highlighted_cell((1, node + 2), color=MEMBER)
-            succ_array.add_highlighted_cell((2, node + 2), color=MEMBER)
+        succ_array = SuccessorTable(sequence, names, nodes=[1, 2, 3, 5, 6, 7, 8, 9, 0, 4], color=MEMBER)\
+            .next_to(table, DOWN)
         self.play(FadeIn(succ_array))
         self.wait()
         self.pause()
+        # an insertion only changes a few cells of the tables, which are the only ones typeset again
+        sequence.save_state()
+        sequence.insert(1, 5)
+        self.play(AnimationGroup(*[diagram.animate_to(sequence), table.animate_to(sequence),
+                                   succ_array.animate_to(sequence), nodes_labels[5].animate.set_color(MEMBER)]))
+        self.wait()
+        self.pause()
+        sequence.restore_state()
+        self.play(AnimationGroup(*[diagram.animate_to(sequence), table.animate_to(sequence),
+                                   succ_array.animate_to(sequence), nodes_labels[5].animate.set_color(POSSIBLE)]))
+        self.pause()
         # highlight differences with Charles Thomas's paper: required nodes
         text_required = Text("Required (R)", color=REQUIRED).scale(0.5).next_to(text_member, DOWN)
         # remove alpha and omega labels, add required label, change node 6 to required and remove npx and nsx
-        cross_npx = Cross(t2.get_columns()[2:4])
+        cross_npx = Cross(table.get_columns()[2:4])
         cross_first = Cross(text_first)
         cross_last = Cross(text_last)
-        self.play(AnimationGroup(*[Create(cross_first), Create(cross_last), dots[6].animate.set_color(REQUIRED),
+        self.play(AnimationGroup(*[Create(cross_first), Create(cross_last), nodes.recolor([6], REQUIRED),
                                    nodes_labels[6].animate.set_color(REQUIRED), FadeIn(text_required), Create(cross_npx)]))
 
         self.pause()
@@ -757,38 +658,28 @@ class Presentation(Slide):
         self.clear()
         # show the complexity
         complexity = Text("API and complexities", color=BLUE).to_corner(UP + LEFT)
-        theta_p = MathTex(r"\Theta(|P|)")
-        theta_1 = MathTex(r"\Theta(1)")
-        table = MobjectTable([
+        table = SparseMobjectTable([
             [Tex("Operation", color=BLUE), Tex("Description", color=BLUE), Tex("Complexity", color=BLUE)],
-            [Tex("isBound(Sq)"), Tex("true iif $\mid P \mid = 0$"), theta_1.copy()],
-            [Tex("is\{Member/Possible/Excluded\}(Sq, $x$)"), Tex("true iff $x \in \{S / P / E\}$"), theta_1.copy()],
+            [Tex("isBound(Sq)"), Tex("true iif $\mid P \mid = 0$"), cached_math_tex(r"\Theta(1)")],
+            [Tex("is\{Member/Possible/Excluded\}(Sq, $x$)"), Tex("true iff $x \in \{S / P / E\}$"), cached_math_tex(r"\Theta(1)")],
             [Tex("get\{Member/Possible/Excluded\}(Sq, $x$)"), Tex("enumerates over $\{S / P / E\}$"),
              MathTex("\Theta(|\{S / P / E\}|)")],
-            [Tex("succ(Sq, $x$)"), Tex("gives the successor of $x$"), theta_1.copy()],
-            [Tex("pred(Sq, $x$)"), Tex("gives the predecessor of $x$"), theta_1.copy()],
-            [Tex("insert(Sq, $p$, $x$)"), Tex("inserts $x$ after node $p$ in Sq"), theta_p.copy()],
-            [Tex("exclude(Sq, $x$)"), Tex("excludes $x$ from Sq"), theta_p.copy()],
-            [Tex("nMemberInserts(Sq, $x$)"), Tex("returns $n_s^x = \mid I^x \cap S \mid $"), theta_1.copy()],
-            [Tex("nPossibleInserts(Sq, $x$)"), Tex("returns $n_p^x = \mid I^x \cap P \mid $"), theta_1.copy()],
+            [Tex("succ(Sq, $x$)"), Tex("gives the successor of $x$"), cached_math_tex(r"\Theta(1)")],
+            [Tex("pred(Sq, $x$)"), Tex("gives the predecessor of $x$"), cached_math_tex(r"\Theta(1)")],
+            [Tex("insert(Sq, $p$, $x$)"), Tex("inserts $x$ after node $p$ in Sq"), cached_math_tex(r"\Theta(|P|)")],
+            [Tex("exclude(Sq, $x$)"), Tex("excludes $x$ from Sq"), cached_math_tex(r"\Theta(|P|)")],
+            [Tex("nMemberInserts(Sq, $x$)"), Tex("returns $n_s^x = \mid I^x \cap S \mid $"), cached_math_tex(r"\Theta(1)")],
+            [Tex("nPossibleInserts(Sq, $x$)"), Tex("returns $n_p^x = \mid I^x \cap P \mid $"), cached_math_tex(r"\Theta(1)")],
             [Tex("getMemberInserts(Sq, $x$)"), Tex("enumerates over $I^x \cap S$"), MathTex("\Theta(\min(|I^x|, |S|))")],
             [Tex("getPossibleInserts(Sq, $x$)"), Tex("enumerates over $I^x \cap P$"), MathTex("\Theta(\min(|I^x|, |P|))")],
-            [Tex("canInsert(Sq, $p$, $x$)"), Tex("true iff $p \in I^x$"), theta_1.copy()],
+            [Tex("canInsert(Sq, $p$, $x$)"), Tex("true iff $p \in I^x$"), cached_math_tex(r"\Theta(1)")],
             [Tex("removeInsert(Sq, $p$, $x$)"), Tex("removes $p$ from $I^x$"), MathTex("\mathcal{O}(|P|)")],
-        ], v_buff=0.1, h_buff=0.2).scale(0.65).next_to(complexity, DOWN).set_x(ORIGIN[0])
+        ], v_buff=0.1, h_buff=0.2, h_lines=[0], line_config={"color": BLUE})\
+            .scale(0.65).next_to(complexity, DOWN).set_x(ORIGIN[0])
 
         #table.remove(*[o for i, o in enumerate(table.get_horizontal_lines()) if i != 0])
         notification = Text("Constraints notified by insertions, exclusion, removal of insertions", color=BLUE) \
             .scale(0.6).next_to(table, DOWN)
-        # TODO color lines in the table
-        for i, o in enumerate(table.get_horizontal_lines()):
-            if i == 0:
-                o.set_color(BLUE)
-            else:
-                table.remove(o)
-
-        for i, o in enumerate(table.get_vertical_lines()):
-            o.set_color(BLUE)
         self.play(FadeIn(complexity))
         self.play(FadeIn(table))
         self.pause()
@@ -856,35 +747,18 @@ class Presentation(Slide):
             np.array([3.5, 1.5, 0]),  # last possible
             np.array([4, -0.2, 0]),
         ]
-        # draw the dots
-        dots = [Dot(i, radius=0.16) for i in coords]
-        # partition of the nodes
-        members = [0, 1, 2, 3, 4]
-        possible = [5, 6, 7, 8]
-        insertions = {
-            5: [0, 1, 2, 3],
-            6: [1, 2, 3, 5],
-            7: [2, 3, 5, 6],
-            8: [1],
-        }
-        excluded = [9]
-        members_group = VGroup(*[dots[i] for i in members]).set_color(MEMBER)
-        excluded_group = VGroup(*[dots[i] for i in excluded]).set_color(EXCLUDED)
-        possible_group = VGroup(*[dots[i] for i in possible]).set_color(POSSIBLE)
-
-        # ordering for the members
-        successors = [Arrow(i.get_center(), j.get_center(), color=MEMBER) for i, j in
-                      zip(members_group, members_group[1:])]
-
-        # predecessors for the nodes
-        insertions_arrows = {
-            node:
-                [DashedArrow(start=dots[pred].get_center(), end=dots[node].get_center(), dashed_ratio=0.4,
-                             dash_length=0.15, color=FG) for pred in v]
-            for node, v in insertions.items()
-        }
-        schema = VGroup(members_group, excluded_group, possible_group, *successors,
-                        *[arrow for n, v in insertions_arrows.items() for arrow in v])\
+        # state of the sequence variable
+        sequence = SequenceVar(len(coords), first=0, last=4)
+        for pred, node in [(0, 1), (1, 2), (2, 3)]:
+            sequence.insert(pred, node)
+        sequence.exclude(9)
+        for node, preds in {5: [0, 1, 2, 3], 6: [1, 2, 3, 5], 7: [2, 3, 5, 6], 8: [1]}.items():
+            sequence.keep_inserts(node, preds)
+        members = sequence.get_members()
+        # the dots, the successors and the insertions, drawn from the state
+        schema = SequenceDiagram(sequence, coords, state_colors=(MEMBER, POSSIBLE, EXCLUDED), insertion_color=FG)
+        nodes = schema.nodes
+        schema\
             .next_to(test_cases_group, DOWN, buff=0.75)\
             .set_x(ORIGIN[0])
         # add time window on top of nodes: values between [0..99]
@@ -901,77 +775,25 @@ class Presentation(Slide):
             [50, 67],
         ]
         # a time window is simply a red rectangle for the invalid time, a green for the valid time and a red again
-        tw_animation_list = []
-        tw_group_list = []
-        height = 0.1
-        tw_rectangles = []
-        for i, dot in enumerate(dots):
-            tw = tws[i]
-            lengths = ([0] + tw + [99])
-            l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-            before = Rectangle(color=RED, fill_opacity=1, width=l[0], height=height, stroke_width=0)
-            during = Rectangle(color=GREEN, fill_opacity=1, width=l[1], height=height, stroke_width=0)
-            after = Rectangle(color=RED, fill_opacity=1, width=l[2], height=height, stroke_width=0)
-            tw_rectangles.append([before, during, after])
-            group = VGroup(before, during, after).arrange(RIGHT, buff=0).next_to(dot, UP)
-            tw_group_list.append(group)
-            animation = GrowFromPoint(group, dot)
-            tw_animation_list.append(animation)
+        tw_bars = TimeWindowBars(tws, nodes)
 
         self.play(FadeIn(schema))
-        self.play(AnimationGroup(*tw_animation_list))
+        self.play(tw_bars.grow())
 
         # time window update
         self.play(FadeIn(filtering_step_1))
         self.pause()
         # grow the "before" part from the sequence
-        transitions = [10, 12, 13, 10]  # durations for the transitions, in integers
-        start = tws[0][0]
-        animations_tw_update = []
-        for i, node in enumerate(members[1:]):
-            start += transitions[i]
-            if start > tws[node][0]:  # need to update the tw
-                lengths = ([0] + tws[node] + [99])
-                l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-                old_length = l[0]
-                tws[node][0] = start
-                lengths = ([0] + tws[node] + [99])
-                l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-                diff = (l[0] - old_length) / 2
-                old_before, old_during = tw_rectangles[node][0], tw_rectangles[node][1]
-                new_before = Rectangle(color=RED, fill_opacity=1, width=l[0], height=height, stroke_width=0)\
-                    .set_x(old_before.get_x() + diff).set_y(old_before.get_y())
-                new_during = Rectangle(color=GREEN, fill_opacity=1, width=l[1], height=height, stroke_width=0)\
-                    .set_x(old_during.get_x() + diff).set_y(old_during.get_y())
-                animations_tw_update.append(AnimationGroup(*[Transform(old_before, new_before), Transform(old_during, new_during)]))
-
-            else:
-                start = tws[node][0]
-        self.play(AnimationGroup(*animations_tw_update, lag_ratio=2))
+        # durations for the transitions between the members, in integers
+        transitions = np.zeros((len(coords), len(coords)), dtype=int)
+        transitions[members[:-1], members[1:]] = [10, 12, 13, 10]
+        tws = time_windows.forward(tws, members, transitions)
+        self.play(tw_bars.animate.set_windows(tws))
         self.pause()
 
         # grow the "after" part from the sequence
-        end = tws[4][1]
-        animations_tw_update = []
-        for i, node in enumerate(members[-2::-1]):  # iterate over from members[0]..members[-2] in reverse order
-            end -= transitions[-i]
-            if end < tws[node][1]:  # need to update the tw
-                lengths = ([0] + tws[node] + [99])
-                l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-                old_length = l[2]
-                tws[node][1] = end
-                lengths = ([0] + tws[node] + [99])
-                l = [(j - i) / 100 for i, j in zip(lengths, lengths[1:])]
-                diff = (l[2] - old_length) / 2
-                old_after, old_during = tw_rectangles[node][2], tw_rectangles[node][1]
-                new_after = Rectangle(color=RED, fill_opacity=1, width=l[2], height=height, stroke_width=0)\
-                    .set_x(old_after.get_x() - diff).set_y(old_after.get_y())
-                new_during = Rectangle(color=GREEN, fill_opacity=1, width=l[1], height=height, stroke_width=0)\
-                    .set_x(old_during.get_x() - diff).set_y(old_during.get_y())
-                animations_tw_update.append(AnimationGroup(*[Transform(old_after, new_after), Transform(old_during, new_during)]))
-            else:
-                end = tws[node][1]
-        self.play(AnimationGroup(*animations_tw_update, lag_ratio=2))
+        tws = time_windows.backward(tws, members, transitions)
+        self.play(tw_bars.animate.set_windows(tws))
         self.pause()
 
         # insertion removal
@@ -980,51 +802,53 @@ class Presentation(Slide):
         self.pause()
         # cannot reach the node from the pred
         node, pred = (5, 2)
-        highlight_1 = SurroundingRectangle(dots[node])
-        highlight_2 = SurroundingRectangle(dots[insertions[node][pred]])
+        highlight_1 = SurroundingRectangle(nodes.get_node(node))
+        highlight_2 = SurroundingRectangle(nodes.get_node(pred))
         self.play(AnimationGroup(*[
             Create(highlight_1),
             Create(highlight_2),
-            insertions_arrows[node][pred].animate.set_color(RED)]))
+            schema.insertions.recolor([schema.pair_index[pred, node]], RED)]))
         self.pause()
+        sequence.remove_insert(pred, node)
         self.play(AnimationGroup(*[
             FadeOut(highlight_1),
             FadeOut(highlight_2),
-            FadeOut(insertions_arrows[node][pred])]))
+            schema.animate_to(sequence)]))
 
         self.pause()
         # cannot close the sequence
-        node, pred = (6, 0)
-        highlight_1 = SurroundingRectangle(dots[node])
-        highlight_2 = SurroundingRectangle(dots[insertions[node][pred]])
-        highlight_3 = SurroundingRectangle(dots[2])
+        node, pred = (6, 1)
+        highlight_1 = SurroundingRectangle(nodes.get_node(node))
+        highlight_2 = SurroundingRectangle(nodes.get_node(pred))
+        highlight_3 = SurroundingRectangle(nodes.get_node(2))
         self.play(AnimationGroup(*[
             Create(highlight_1),
             Create(highlight_2),
             Create(highlight_3),
-            insertions_arrows[node][pred].animate.set_color(RED)]))
+            schema.insertions.recolor([schema.pair_index[pred, node]], RED)]))
         self.pause()
+        sequence.remove_insert(pred, node)
         self.play(AnimationGroup(*[
             FadeOut(highlight_1),
             FadeOut(highlight_2),
             FadeOut(highlight_3),
-            FadeOut(insertions_arrows[node][pred])]))
+            schema.animate_to(sequence)]))
 
         self.pause()
-        # exceeding max distance
-        node, pred = (8, 0)
-        highlight_1 = SurroundingRectangle(dots[node])
-        highlight_2 = SurroundingRectangle(dots[insertions[node][pred]])
+        # exceeding max distance, the node being excluded without insertion left
+        node, pred = (8, 1)
+        highlight_1 = SurroundingRectangle(nodes.get_node(node))
+        highlight_2 = SurroundingRectangle(nodes.get_node(pred))
         self.play(AnimationGroup(*[
             Create(highlight_1),
             Create(highlight_2),
-            insertions_arrows[node][pred].animate.set_color(RED)]))
+            schema.insertions.recolor([schema.pair_index[pred, node]], RED)]))
         self.pause()
+        sequence.remove_insert(pred, node)
         self.play(AnimationGroup(*[
             FadeOut(highlight_1),
             FadeOut(highlight_2),
-            FadeOut(insertions_arrows[node][pred])]))
-        self.play(dots[node].animate.set_color(EXCLUDED))
+            schema.animate_to(sequence)]))
 
         self.pause()
         self.clear()
@@ -1180,7 +1004,7 @@ class Presentation(Slide):
 
         # tsptw
         text_results_tsptw = Text("Improved 32 instances in total").scale(0.7)
-        table_tsptw = MobjectTable([
+        table_tsptw = SparseMobjectTable([
             [Tex("Instance", color=BLUE),
              Tex("Previous best", color=BLUE),
              Tex("New best", color=BLUE),
@@ -1196,17 +1020,11 @@ class Presentation(Slide):
             [Tex("rbg201"), Tex("12,967"), Tex("12,948"), Tex("152.53")],
             [Tex("rbg233"), Tex("15,031"), Tex("14,994"), Tex("264.70")],
             [Tex("rbg233.2"), Tex("14,549"), Tex("14,523"), Tex("24.20")],
-        ], v_buff=0.15, h_buff=1, arrange_in_grid_config={"cell_alignment": RIGHT})\
+        ], v_buff=0.15, h_buff=1, arrange_in_grid_config={"cell_alignment": RIGHT}, h_lines=[0],
+            line_config={"color": BLUE})\
             .scale(0.8)\
             .next_to(title_tsptw, DOWN, buff=TITLE_BUF).set_x(ORIGIN[0])
         text_results_tsptw.to_corner(DOWN + LEFT)
-        for i, o in enumerate(table_tsptw.get_horizontal_lines()):
-            if i == 0:
-                o.set_color(BLUE)
-            else:
-                table_tsptw.remove(o)
-        for i, o in enumerate(table_tsptw.get_vertical_lines()):
-            o.set_color(BLUE)
         # table.remove(*[o for i, o in enumerate(table.get_horizontal_lines()) if i != 0])
 
         self.play(FadeIn(title_tsptw))
@@ -1260,7 +1078,7 @@ class Presentation(Slide):
         #myTemplate = TexTemplate()
         #myTemplate.add_to_preamble(r"\usepackage{xcolor}")
         text_resuts_darp = Text("Mean of 10 runs of 15 minutes, initial solution provided").scale(0.6)
-        table_darp = MobjectTable([
+        table_darp = SparseMobjectTable([
             [Tex("m", color=BLUE),
              Tex("n", color=BLUE),
              Tex("LNS-FFPA", color=BLUE),
@@ -1268,25 +1086,19 @@ class Presentation(Slide):
              Tex("CPO", color=BLUE)
              ],
             [Tex("3"), Tex("24"), Tex("191.76"), Tex("190.89", color=TABLE_HIGHLIGHT), Tex("196.11")],
-            [Tex("4"), Tex("36"), Tex("291.71", color=TABLE_HIGHLIGHT), Tex("294.72"), Tex("318.97")],
+            [Tex("4"), cached_tex("36"), Tex("291.71", color=TABLE_HIGHLIGHT), Tex("294.72"), Tex("318.97")],
             [Tex("5"), Tex("48"), Tex("308.95"), Tex("309.09", color=TABLE_HIGHLIGHT), Tex("327.37")],
-            [Tex("6"), Tex("72"), Tex("532.55"), Tex("531.84", color=TABLE_HIGHLIGHT), Tex("579.79")],
-            [Tex("7"), Tex("72"), Tex("554.57", color=TABLE_HIGHLIGHT), Tex("554.65"), Tex("614.02")],
-            [Tex("8"), Tex("108"), Tex("752.29", color=TABLE_HIGHLIGHT), Tex("794.86"), Tex("924.04")],
-            [Tex("9"), Tex("96"), Tex("622.19", color=TABLE_HIGHLIGHT), Tex("625.68"), Tex("740.26")],
-            [Tex("10"), Tex("144"), Tex("950.16", color=TABLE_HIGHLIGHT), Tex("1011.42"), Tex("t/o")],
+            [Tex("6"), cached_tex("72"), Tex("532.55"), Tex("531.84", color=TABLE_HIGHLIGHT), Tex("579.79")],
+            [Tex("7"), cached_tex("72"), Tex("554.57", color=TABLE_HIGHLIGHT), Tex("554.65"), Tex("614.02")],
+            [cached_tex("8"), Tex("108"), Tex("752.29", color=TABLE_HIGHLIGHT), Tex("794.86"), Tex("924.04")],
+            [cached_tex("9"), Tex("96"), Tex("622.19", color=TABLE_HIGHLIGHT), Tex("625.68"), Tex("740.26")],
+            [Tex("10"), cached_tex("144"), Tex("950.16", color=TABLE_HIGHLIGHT), Tex("1011.42"), Tex("t/o")],
             [Tex("11"), Tex("120"), Tex("699.32", color=TABLE_HIGHLIGHT), Tex("718.58"), Tex("861.74")],
-            [Tex("13"), Tex("144"), Tex("878.33", color=TABLE_HIGHLIGHT), Tex("901.71"), Tex("1042.82")],
-        ], v_buff=0.15, h_buff=1, arrange_in_grid_config={"cell_alignment": RIGHT})\
+            [Tex("13"), cached_tex("144"), Tex("878.33", color=TABLE_HIGHLIGHT), Tex("901.71"), Tex("1042.82")],
+        ], v_buff=0.15, h_buff=1, arrange_in_grid_config={"cell_alignment": RIGHT}, h_lines=[0],
+            line_config={"color": BLUE})\
             .scale(0.9).next_to(title_tsptw, DOWN, buff=TITLE_BUF).set_x(ORIGIN[0])
         text_resuts_darp.to_corner(DOWN + LEFT)
-        for i, o in enumerate(table_darp.get_horizontal_lines()):
-            if i == 0:
-                o.set_color(BLUE)
-            else:
-                table_darp.remove(o)
-        for i, o in enumerate(table_darp.get_vertical_lines()):
-            o.set_color(BLUE)
 
         '''
         table_darp = Tex(r"""
@@ -1322,7 +1134,7 @@ class Presentation(Slide):
         self.play(AnimationGroup(*[FadeOut(title_darp, table_darp, text_resuts_darp)]))
 
         # ptp
-        table_ptp = MobjectTable([
+        table_ptp = SparseMobjectTable([
             [Tex("Difficulty"),
              Tex("Name"),
              Tex("$|H|$"),
@@ -1331,27 +1143,18 @@ class Presentation(Slide):
              Tex(r"SCHED\\+MSS"),
              Tex("Sequence"),
              ],
-            [Tex("Easy"), Tex("RAND-E-8"), Tex("32"), Tex("12"), Tex("128"), Tex("128", color=TABLE_HIGHLIGHT), Tex("128", color=TABLE_HIGHLIGHT)],
-            [Tex("Easy"), Tex("RAND-E-9"), Tex("36"), Tex("14"), Tex("144"), Tex("144", color=TABLE_HIGHLIGHT), Tex("143")],
-            [Tex("Easy"), Tex("RAND-E-10"), Tex("40"), Tex("12"), Tex("160"), Tex("158", color=TABLE_HIGHLIGHT), Tex("156")],
-            [Tex("Medium"), Tex("RAND-M-8"), Tex("64"), Tex("8"), Tex("128"), Tex("89"), Tex("91", color=TABLE_HIGHLIGHT)],
-            [Tex("Medium"), Tex("RAND-M-9"), Tex("72"), Tex("8"), Tex("144"), Tex("89"), Tex("93", color=TABLE_HIGHLIGHT)],
-            [Tex("Medium"), Tex("RAND-M-10"), Tex("80"), Tex("9"), Tex("160"), Tex("109"), Tex("113", color=TABLE_HIGHLIGHT)],
-            [Tex("Hard"), Tex("RAND-H-8"), Tex("128"), Tex("8"), Tex("128"), Tex("77"), Tex("87", color=TABLE_HIGHLIGHT)],
-            [Tex("Hard"), Tex("RAND-H-9"), Tex("144"), Tex("8"), Tex("144"), Tex("78"), Tex("84", color=TABLE_HIGHLIGHT)],
-            [Tex("Hard"), Tex("RAND-H-10"), Tex("160"), Tex("8"), Tex("160"), Tex("76"), Tex("84", color=TABLE_HIGHLIGHT)],
-        ], v_buff=0.15, h_buff=0.4, arrange_in_grid_config={"cell_alignment": RIGHT})\
+            [cached_tex("Easy"), Tex("RAND-E-8"), Tex("32"), cached_tex("12"), cached_tex("128"), cached_tex("128", color=TABLE_HIGHLIGHT), cached_tex("128", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Easy"), Tex("RAND-E-9"), cached_tex("36"), Tex("14"), cached_tex("144"), Tex("144", color=TABLE_HIGHLIGHT), Tex("143")],
+            [cached_tex("Easy"), Tex("RAND-E-10"), Tex("40"), cached_tex("12"), cached_tex("160"), Tex("158", color=TABLE_HIGHLIGHT), Tex("156")],
+            [cached_tex("Medium"), Tex("RAND-M-8"), Tex("64"), cached_tex("8"), cached_tex("128"), cached_tex("89"), Tex("91", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Medium"), Tex("RAND-M-9"), cached_tex("72"), cached_tex("8"), cached_tex("144"), cached_tex("89"), Tex("93", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Medium"), Tex("RAND-M-10"), Tex("80"), cached_tex("9"), cached_tex("160"), Tex("109"), Tex("113", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Hard"), Tex("RAND-H-8"), cached_tex("128"), cached_tex("8"), cached_tex("128"), Tex("77"), Tex("87", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Hard"), Tex("RAND-H-9"), cached_tex("144"), cached_tex("8"), cached_tex("144"), Tex("78"), cached_tex("84", color=TABLE_HIGHLIGHT)],
+            [cached_tex("Hard"), Tex("RAND-H-10"), cached_tex("160"), cached_tex("8"), cached_tex("160"), Tex("76"), cached_tex("84", color=TABLE_HIGHLIGHT)],
+        ], v_buff=0.15, h_buff=0.4, arrange_in_grid_config={"cell_alignment": RIGHT},
+            h_lines=lambda i: i % 3 == 0, v_lines=[4, 5], line_config={"color": BLUE})\
             .next_to(title_tsptw, DOWN, buff=TITLE_BUF).set_x(ORIGIN[0])
-        for i, o in enumerate(table_ptp.get_horizontal_lines()):
-            if i % 3 == 0:
-                o.set_color(BLUE)
-            else:
-                table_ptp.remove(o)
-        for i, o in enumerate(table_ptp.get_vertical_lines()):
-            if i in [4, 5]:
-                o.set_color(BLUE)
-            else:
-                table_ptp.remove(o)
 
         self.play(FadeIn(title_ptp))
         self.play(FadeIn(ptp_desc_group))
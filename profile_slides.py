@@ -0,0 +1,166 @@
+# measure where the rendering time of each play() and wait() of the slides is spent
+"""
+the slides are rendered for real, the manim internals being wrapped to measure the wall time spent in:
+- construction: the code of construct() executed since the previous play, building the mobjects
+- tex: the compilation of the Tex strings (latex and dvisvgm)
+- rasterization: the drawing of the frames by cairo
+- encoding: the writing of the frames in the movie files
+- other: the remaining time of the play, mostly the interpolation of the animations
+the most expensive calls are reported with their line in the file of the slides
+"""
+import argparse
+import functools
+import os
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+import manim.utils.tex_file_writing as tex_file_writing
+from manim import Scene, Wait, config
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+
+from dry_run import load_slides, qualities
+from merge_slide import select_slides, slide_names, to_merge
+
+categories = ["construction", "tex", "rasterization", "encoding", "other"]
+# functions whose duration is attributed to a category
+timed_functions = [
+    (tex_file_writing, "compile_tex", "tex"),
+    (tex_file_writing, "convert_to_svg", "tex"),
+    (CairoRenderer, "update_frame", "rasterization"),
+    (SceneFileWriter, "begin_animation", "encoding"),
+    (SceneFileWriter, "write_frame", "encoding"),
+    (SceneFileWriter, "end_animation", "encoding"),
+]
+
+
+def describe(animation):
+    # name of an animation given to play, Dot.animate for an animation built with .animate
+    if type(animation).__name__ == "_AnimationBuilder":
+        return f"{type(animation.mobject).__name__}.animate"
+    return type(animation).__name__
+
+
+class Profiler:
+
+    def __init__(self, file_name=to_merge):
+        self.file_name = os.path.abspath(file_name)
+        self.totals = defaultdict(float)  # time spent in each category since the start
+        self.records = []
+        self.slide = None
+        self.last_clock = time.perf_counter()
+        self.last_totals = dict(self.totals)
+
+    def timed(self, category, function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self.totals[category] += time.perf_counter() - start
+        return wrapper
+
+    def spent(self):
+        # time spent in each category since the last mark
+        return {category: self.totals[category] - self.last_totals.get(category, 0) for category in categories}
+
+    def mark(self):
+        self.last_clock = time.perf_counter()
+        self.last_totals = dict(self.totals)
+
+    def line(self):
+        # line of the file of the slides calling play
+        frame = sys._getframe(2)
+        while frame is not None:
+            if os.path.abspath(frame.f_code.co_filename) == self.file_name:
+                return frame.f_lineno
+            frame = frame.f_back
+        return None
+
+    def profiled_play(self, play):
+        @functools.wraps(play)
+        def wrapper(scene, *args, **kwargs):
+            # the code executed since the previous play built the mobjects of this one
+            before = self.spent()
+            construction = time.perf_counter() - self.last_clock - before["tex"]
+            self.mark()
+            try:
+                return play(scene, *args, **kwargs)
+            finally:
+                during = self.spent()
+                wall = time.perf_counter() - self.last_clock
+                record = dict(
+                    slide=self.slide,
+                    line=self.line(),
+                    kind="wait" if len(args) == 1 and isinstance(args[0], Wait) else "play",
+                    animations=", ".join(describe(a) for a in args),
+                    construction=construction,
+                    tex=before["tex"] + during["tex"],
+                    rasterization=during["rasterization"],
+                    encoding=during["encoding"],
+                    other=wall - during["tex"] - during["rasterization"] - during["encoding"],
+                )
+                record["total"] = sum(record[category] for category in categories)
+                self.records.append(record)
+                self.mark()
+        return wrapper
+
+    @contextmanager
+    def instrument(self):
+        originals = [(owner, name, getattr(owner, name)) for owner, name, _ in timed_functions]
+        originals.append((Scene, "play", Scene.play))
+        for owner, name, category in timed_functions:
+            setattr(owner, name, self.timed(category, getattr(owner, name)))
+        Scene.play = self.profiled_play(Scene.play)
+        try:
+            yield self
+        finally:
+            for owner, name, function in originals:
+                setattr(owner, name, function)
+
+    def profile(self, slide_class):
+        self.slide = slide_class.__name__
+        with self.instrument():
+            scene = slide_class()
+            self.mark()
+            # the files are not copied to the presentation folder
+            Scene.render(scene)
+
+
+def report(records, top=20):
+    print(f"{'total':>8}{'constr.':>9}{'tex':>8}{'raster.':>9}{'encod.':>8}{'other':>8}  {'slide':<18}{'line':>6}  call")
+    for r in sorted(records, key=lambda r: r["total"], reverse=True)[:top]:
+        print(f"{r['total']:>7.2f}s{r['construction']:>8.2f}s{r['tex']:>7.2f}s{r['rasterization']:>8.2f}s"
+              f"{r['encoding']:>7.2f}s{r['other']:>7.2f}s  {r['slide']:<18}{r['line'] or '?':>6}  "
+              f"{r['kind']}({r['animations']})")
+    print()
+    print(f"{'slide':<20}" + "".join(f"{category:>15}" for category in categories))
+    slides = list(dict.fromkeys(r["slide"] for r in records))
+    for slide in slides:
+        print(f"{slide:<20}" + "".join(f"{sum(r[c] for r in records if r['slide'] == slide):>14.2f}s"
+                                       for c in categories))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"profile the rendering of the slides from {to_merge}")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to profile, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("-q", "--quality", default="l", choices="lmhpk", help="manim render quality")
+    parser.add_argument("-n", "--top", type=int, default=20, help="number of calls reported")
+    args = parser.parse_args()
+
+    config.quality = qualities[args.quality]
+    config.progress_bar = "none"
+    # every animation must be rendered, not taken from the cache of manim
+    config.disable_caching = True
+    names = slide_names()
+    if args.slides is not None:
+        names = select_slides(names, args.slides)
+    module = load_slides()
+    profiler = Profiler()
+    for name in names:
+        profiler.profile(getattr(module, name))
+    report(profiler.records, args.top)
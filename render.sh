@@ -1,5 +1,3 @@
 # render the visualisation from sequence-slide.py and run it
-rm -rf media
-python3 merge_slide.py
-manim -qh presentation.py
+python3 render_slides.py -q h
 manim-presentation --fullscreen Presentation
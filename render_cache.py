@@ -0,0 +1,192 @@
+# content-addressed cache of the rendered slides
+"""
+a slide is identified by a hash of everything its rendering depends on:
+the source of the class, the module-level definitions it uses, the other module-level statements (imports,
+config, ...), the local modules imported directly or by other local modules, the files it reads, the quality and the versions of manim and manim-presentation
+the movie files of a rendered slide are moved to cache_folder/<hash>/, together with its pause metadata
+"""
+import argparse
+import ast
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from importlib import metadata
+
+cache_folder = "render_cache"
+output_folder = "presentation"  # folder used by manim-presentation
+config_name = "slide.json"
+
+
+def _version(package):
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def _defined_names(node):
+    # names bound by a module-level definition, empty if the statement is not a definition
+    if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
+        return [node.name]
+    if isinstance(node, ast.Assign) and all(isinstance(target, ast.Name) for target in node.targets):
+        return [target.id for target in node.targets]
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return [node.target.id]
+    return []
+
+
+def _used_names(node):
+    return {n.id for n in ast.walk(node) if isinstance(n, ast.Name)}
+
+
+def _local_modules(node, folder):
+    # modules imported from files next to the slides
+    if isinstance(node, ast.Import):
+        modules = [alias.name for alias in node.names]
+    elif isinstance(node, ast.ImportFrom) and node.module is not None and not node.level:
+        modules = [node.module]
+    else:
+        return []
+    paths = [os.path.join(folder, *module.split(".")) + ".py" for module in modules]
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def _imported_modules(nodes, folder):
+    # local modules imported by the statements, followed through the imports of these modules
+    paths = []
+    to_visit = [path for node in nodes for path in _local_modules(node, folder)]
+    while to_visit:
+        path = to_visit.pop()
+        if path in paths:
+            continue
+        paths.append(path)
+        with open(path) as file:
+            tree = ast.parse(file.read())
+        to_visit += [module for node in ast.walk(tree) for module in _local_modules(node, folder)]
+    return sorted(paths)
+
+
+def _read_files(node, folder):
+    # string constants naming an existing file (images in res/, results_tsptw.txt, ...)
+    return [n.value for n in ast.walk(node) if isinstance(n, ast.Constant) and isinstance(n.value, str)
+            and len(n.value) < 256 and os.path.isfile(os.path.join(folder, n.value))]
+
+
+def _hash_file(digest, folder, path):
+    path = os.path.join(folder, path)
+    digest.update(os.path.relpath(path, folder).encode())
+    with open(path, "rb") as file:
+        digest.update(file.read())
+
+
+def slide_keys(file_name, names, quality):
+    # hash for each slide in names
+    folder = os.path.dirname(os.path.abspath(file_name))
+    with open(file_name) as file:
+        source = file.read()
+    tree = ast.parse(source)
+    definitions = {}
+    shared = []  # statements that may affect every slide
+    classes = {}
+    for node in tree.body:
+        defined = _defined_names(node)
+        for name in defined:
+            definitions[name] = node
+        if isinstance(node, ast.ClassDef) and node.name in names:
+            classes[node.name] = node
+        elif not defined:
+            shared.append(node)
+
+    common = hashlib.sha256()
+    for item in [quality, _version("manim"), _version("manim-presentation")]:
+        common.update(item.encode())
+    for node in shared:
+        common.update(ast.get_source_segment(source, node, padded=True).encode())
+    for path in _imported_modules(shared, folder):
+        _hash_file(common, folder, path)
+
+    keys = {}
+    for name in names:
+        # module-level definitions used by the slide, transitively
+        used = []
+        to_visit = [classes[name]]
+        while to_visit:
+            node = to_visit.pop()
+            if node in used:
+                continue
+            used.append(node)
+            to_visit += [definitions[n] for n in _used_names(node) if n in definitions and n != name]
+        digest = common.copy()
+        for node in sorted(used, key=lambda n: n.lineno):
+            digest.update(ast.get_source_segment(source, node, padded=True).encode())
+            for path in sorted(set(_read_files(node, folder))):
+                _hash_file(digest, folder, path)
+        keys[name] = digest.hexdigest()
+    return keys
+
+
+def lookup(key):
+    # path to the pause metadata of a cached slide, None if the slide is not cached
+    path = os.path.join(cache_folder, key, config_name)
+    return path if os.path.isfile(path) else None
+
+
+def _publish(name, config):
+    # make the slide viewable on its own with manim-presentation
+    os.makedirs(output_folder, exist_ok=True)
+    with open(os.path.join(output_folder, f"{name}.json"), "w") as file:
+        json.dump(config, file)
+
+
+def store(name, key):
+    # move the files of a freshly rendered slide into the cache
+    folder = os.path.join(cache_folder, key)
+    tmp_folder = f"{folder}.tmp"
+    shutil.rmtree(tmp_folder, ignore_errors=True)
+    os.makedirs(tmp_folder)
+    with open(os.path.join(output_folder, f"{name}.json")) as file:
+        config = json.load(file)
+    files = []
+    for src_file in config["files"]:
+        shutil.move(src_file, os.path.join(tmp_folder, os.path.basename(src_file)))
+        files.append(os.path.join(folder, os.path.basename(src_file)))
+    config["files"] = files
+    with open(os.path.join(tmp_folder, config_name), "w") as file:
+        json.dump(config, file)
+    shutil.rmtree(folder, ignore_errors=True)
+    os.replace(tmp_folder, folder)
+    _publish(name, config)
+    return os.path.join(folder, config_name)
+
+
+def restore(name, key):
+    # serve a slide from the cache
+    path = lookup(key)
+    with open(path) as file:
+        _publish(name, json.load(file))
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="check that editing a local file changes the keys of the slides")
+    parser.add_argument("file_name", help="file of the slides, such as sequence-slide.py")
+    parser.add_argument("edited", help="local file edited, such as trail.py")
+    parser.add_argument("slides", nargs="+", help="slides whose key must change")
+    args = parser.parse_args()
+    # the folder is copied, such that the edit does not touch the sources
+    folder = os.path.dirname(os.path.abspath(args.file_name))
+    with tempfile.TemporaryDirectory() as copy:
+        for name in os.listdir(folder):
+            if name.endswith(".py"):
+                shutil.copy(os.path.join(folder, name), copy)
+        file_name = os.path.join(copy, os.path.basename(args.file_name))
+        before = slide_keys(file_name, args.slides, "check")
+        with open(os.path.join(copy, args.edited), "a") as file:
+            file.write("\n# edited\n")
+        after = slide_keys(file_name, args.slides, "check")
+    unchanged = [name for name in args.slides if before[name] == after[name]]
+    if unchanged:
+        raise SystemExit(f"editing {args.edited} does not change the key of {', '.join(unchanged)}")
+    print(f"editing {args.edited} changes the key of {', '.join(args.slides)}")
@@ -0,0 +1,95 @@
+# render every Slide from a file in parallel and stitch them together to form one presentation
+"""
+each slide is rendered by its own manim process, in the order in which they are written
+the pause metadata of all slides is then concatenated into a single presentation whose animations
+point to the partial movie files already written by manim-presentation: nothing is re-encoded
+slides whose sources did not change since their last rendering are served from the render cache
+the Tex strings of the slides to render are compiled beforehand, all at once, by tex_warmup.py
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import render_cache
+from check_slides import check_slides, report
+from merge_slide import select_slides, slide_names
+
+to_render = "sequence-slide.py"
+output_folder = "presentation"  # folder used by manim-presentation
+stitched = "Presentation"
+
+
+def render_slide(name, quality):
+    # the slides share the Tex folder: the cleanup of one process must not remove the files of another one
+    command = ["manim", f"-q{quality}", "--no_latex_cleanup", to_render, name]
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"rendering of {name} failed\n{result.stdout}\n{result.stderr}")
+    return name
+
+
+def render_slides(names, quality, jobs=None, warmup=True):
+    # render the slides missing from the cache and return the path to the pause metadata of each slide
+    keys = render_cache.slide_keys(to_render, names, quality)
+    configs = {}
+    to_do = []
+    for name in names:
+        if render_cache.lookup(keys[name]) is not None:
+            configs[name] = render_cache.restore(name, keys[name])
+            print(f"cached {name}")
+        else:
+            to_do.append(name)
+    if to_do and warmup:
+        from tex_warmup import warmup as warmup_tex
+
+        for error in warmup_tex(to_render, ",".join(to_do), jobs):
+            print(error, file=sys.stderr)
+    # the manim processes run concurrently, the threads only wait for them
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        futures = [pool.submit(render_slide, name, quality) for name in to_do]
+        for future in as_completed(futures):
+            name = future.result()
+            configs[name] = render_cache.store(name, keys[name])
+            print(f"rendered {name}")
+    return [configs[name] for name in names]
+
+
+def stitch(configs, name=stitched):
+    # concatenate the slides and files of each scene, shifting the animations indices
+    slides = []
+    files = []
+    for path in configs:
+        with open(path) as file:
+            config = json.load(file)
+        offset = len(files)
+        for slide in config["slides"]:
+            slides.append(dict(slide,
+                               start_animation=slide["start_animation"] + offset,
+                               end_animation=slide["end_animation"] + offset,
+                               number=len(slides) + 1))
+        files += config["files"]
+    with open(os.path.join(output_folder, f"{name}.json"), "w") as file:
+        json.dump(dict(slides=slides, files=files), file)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"render the slides from {to_render} in parallel")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides to render, such as Sequences..TransitionTime or MainTitle,Problems (all by default)")
+    parser.add_argument("-q", "--quality", default="l", choices="lmhpk", help="manim render quality")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of slides rendered at once")
+    parser.add_argument("--no-check", action="store_true", help="do not check the slides before rendering them")
+    parser.add_argument("--no-warmup", action="store_true", help="do not compile the Tex strings beforehand")
+    args = parser.parse_args()
+
+    if not args.no_check and not report(check_slides(to_render, args.slides, workers=args.jobs)):
+        sys.exit(1)
+
+    names = slide_names(to_render)
+    if args.slides is not None:
+        names = select_slides(names, args.slides)
+    stitch(render_slides(names, args.quality, args.jobs, not args.no_warmup))
+    print(f"manim-presentation --fullscreen {stitched}")
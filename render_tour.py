@@ -0,0 +1,51 @@
+# render the tour of a benchmark instance
+"""
+the nodes of the instance (see instances.py) are drawn as a NodeLayer and the edges of the tour as a single
+ArrowField (new_geometry.Tour), growing along the routes as in VRPIntro: one color per route for several vehicles
+the routes are read from a file given by the solver (one route per line), or the nodes are visited by earliest time
+the wall time of the rendering is reported
+"""
+import argparse
+import time
+
+import numpy as np
+from manim import *
+
+from dry_run import qualities
+from instances import earliest_order, load_instance, load_routes
+from new_geometry import Tour
+
+route_colors = [BLUE, PURPLE, TEAL, ORANGE, PINK, GOLD]
+
+
+class TourScene(Scene):
+
+    def __init__(self, instance, routes, **kwargs):
+        self.instance = instance
+        self.routes = routes
+        super().__init__(**kwargs)
+
+    def construct(self):
+        title = Text(self.instance.name, color=BLUE).scale(0.7).to_corner(UP + LEFT)
+        tour = Tour(np.asarray(self.instance.coords), self.routes, colors=route_colors, height=6.5)
+        tour.next_to(title, DOWN).set_x(0)
+        self.play(FadeIn(title), FadeIn(tour.nodes))
+        for route in range(len(self.routes)):
+            self.play(tour.grow([route], lag_ratio=0.2, run_time=3))
+        self.wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="render the tour of a TSPTW instance")
+    parser.add_argument("instance", help="path of the instance or name in instances/, such as rbg233")
+    parser.add_argument("routes", nargs="?", default=None,
+                        help="file with one route per line (nodes visited by earliest time by default)")
+    parser.add_argument("-q", "--quality", default="h", choices="lmhpk", help="manim render quality")
+    args = parser.parse_args()
+
+    instance = load_instance(args.instance)
+    routes = load_routes(args.routes) if args.routes is not None else [earliest_order(instance)]
+    start = time.perf_counter()
+    with tempconfig({"quality": qualities[args.quality], "output_file": f"tour_{instance.name}"}):
+        TourScene(instance, routes).render()
+    print(f"{instance.name}: {len(instance.windows)} nodes rendered in {time.perf_counter() - start:.1f}s")
@@ -0,0 +1,202 @@
+# binary traces of the operations on a sequence variable, such as the ones of an LNS run
+"""
+a trace is an append-only file: a header of 24 bytes, then one record of 13 bytes per event, little-endian
+- header: the magic b"SEQTRACE", then n, first and last of the variable and a version, as int32
+- record: the kind of the event as uint8, then node, a and b as int32
+
+kind               node   a          b
+0 insert           node   pred
+1 exclude          node
+2 remove_insert    node   pred
+3 tighten          node   earliest   latest
+4 checkpoint
+5 backtrack
+
+the times of the time windows are integers, as in the benchmark instances
+the records are written by blocks, and read memory-mapped by chunks, such that a trace of millions of events is
+streamed by a generator instead of being loaded whole; a record left incomplete by an interrupted run is ignored
+a trace starts from the initial domain of the variable: replay applies its events to a new SequenceVar, the time
+windows being reverted with the variable on backtrack
+"""
+import argparse
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from sequence_var import SequenceVar
+
+magic = b"SEQTRACE"
+version = 1
+header_dtype = np.dtype([("magic", "S8"), ("n", "<i4"), ("first", "<i4"), ("last", "<i4"), ("version", "<i4")])
+record_dtype = np.dtype([("kind", "u1"), ("node", "<i4"), ("a", "<i4"), ("b", "<i4")])
+kinds = ["insert", "exclude", "remove_insert", "tighten", "checkpoint", "backtrack"]
+INSERT, EXCLUDE, REMOVE_INSERT, TIGHTEN, CHECKPOINT, BACKTRACK = range(len(kinds))
+
+Header = namedtuple("Header", ["n", "first", "last"])
+Event = namedtuple("Event", ["kind", "node", "a", "b"])
+
+
+class TraceWriter:
+    """
+    appends the events to a trace, by blocks of buffer_size records; an existing trace is continued if it is of
+    the same variable
+    the writer can be given to a SequenceVar as trace, its operations being recorded as they are done
+    """
+
+    def __init__(self, path, n, first=0, last=None, buffer_size=1 << 16):
+        self.header = Header(n, first, n - 1 if last is None else last)
+        if os.path.isfile(path) and os.path.getsize(path) > 0:
+            if read_header(path) != self.header:
+                raise ValueError(f"{path} is the trace of another variable: {read_header(path)}")
+            # a record left incomplete is dropped, such that the next ones stay aligned
+            os.truncate(path, header_dtype.itemsize + num_events(path) * record_dtype.itemsize)
+        else:
+            with open(path, "wb") as file:
+                file.write(np.array([(magic, *self.header, version)], dtype=header_dtype).tobytes())
+        self.file = open(path, "ab")
+        self.buffer = np.zeros(buffer_size, dtype=record_dtype)
+        self.count = 0
+        self.num_events = 0
+
+    def _append(self, kind, node=0, a=0, b=0):
+        self.buffer[self.count] = (kind, node, a, b)
+        self.count += 1
+        self.num_events += 1
+        if self.count == len(self.buffer):
+            self.flush()
+
+    def insert(self, pred, node):
+        self._append(INSERT, node, pred)
+
+    def exclude(self, node):
+        self._append(EXCLUDE, node)
+
+    def remove_insert(self, pred, node):
+        self._append(REMOVE_INSERT, node, pred)
+
+    def tighten(self, node, earliest, latest):
+        self._append(TIGHTEN, node, earliest, latest)
+
+    def checkpoint(self):
+        self._append(CHECKPOINT)
+
+    def backtrack(self):
+        self._append(BACKTRACK)
+
+    def flush(self):
+        self.file.write(self.buffer[:self.count].tobytes())
+        self.file.flush()
+        self.count = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_header(path):
+    header = np.fromfile(path, dtype=header_dtype, count=1)
+    if len(header) == 0 or header["magic"][0] != magic:
+        raise ValueError(f"{path} is not a sequence trace")
+    if header["version"][0] != version:
+        raise ValueError(f"{path} has version {header['version'][0]} instead of {version}")
+    return Header(*(int(header[key][0]) for key in Header._fields))
+
+
+def num_events(path):
+    # complete records of the trace
+    return (os.path.getsize(path) - header_dtype.itemsize) // record_dtype.itemsize
+
+
+def chunks(path, chunk_size=1 << 16):
+    # structured arrays of at most chunk_size consecutive records, read memory-mapped
+    read_header(path)
+    count = num_events(path)
+    if count == 0:
+        return
+    records = np.memmap(path, dtype=record_dtype, mode="r", offset=header_dtype.itemsize, shape=(count,))
+    for start in range(0, count, chunk_size):
+        yield records[start:start + chunk_size]
+
+
+def events(path, chunk_size=1 << 16):
+    # Event of every record, in order
+    for chunk in chunks(path, chunk_size):
+        yield from map(Event._make, zip(*(chunk[key].tolist() for key in Event._fields)))
+
+
+def replay(path, windows=None, chunk_size=1 << 16):
+    """
+    applies the events of the trace to a new SequenceVar, yielding (event, sequence, windows) after each of them,
+    windows being the time windows (earliest, latest) of the nodes, [-inf, inf] unless given
+    """
+    header = read_header(path)
+    sequence = SequenceVar(header.n, header.first, header.last)
+    if windows is None:
+        windows = np.tile([-np.inf, np.inf], (header.n, 1))
+    windows = np.array(windows, dtype=float)
+    operations = {
+        INSERT: lambda event: sequence.insert(event.a, event.node),
+        EXCLUDE: lambda event: sequence.exclude(event.node),
+        REMOVE_INSERT: lambda event: sequence.remove_insert(event.a, event.node),
+        TIGHTEN: lambda event: (sequence.trail.write(windows, (event.node, 0), event.a),
+                                sequence.trail.write(windows, (event.node, 1), event.b)),
+        CHECKPOINT: lambda event: sequence.save_state(),
+        BACKTRACK: lambda event: sequence.restore_state(),
+    }
+    for event in events(path, chunk_size):
+        operations[event.kind](event)
+        yield event, sequence, windows
+
+
+def random_search(writer, n, num_events, seed=0):
+    # dives inserting or excluding random nodes, each one undone by backtracking, until writer has num_events
+    rng = np.random.default_rng(seed)
+    sequence = SequenceVar(n, trace=writer)
+    while writer.num_events < num_events:
+        depth = 0
+        while not sequence.is_bound() and writer.num_events < num_events:
+            sequence.save_state()
+            depth += 1
+            node = rng.choice(sequence.get_possible())
+            preds = sequence.get_member_inserts(node)
+            if len(preds) and rng.random() < 0.8:
+                sequence.insert(rng.choice(preds), node)
+            else:
+                sequence.exclude(node)
+        for _ in range(depth):
+            sequence.restore_state()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="summarize sequence traces, or write random ones")
+    parser.add_argument("paths", nargs="+", help="traces to read")
+    parser.add_argument("-r", "--random", type=int, default=0,
+                        help="write a random search of this number of events to the first path before reading it")
+    parser.add_argument("-n", "--nodes", type=int, default=100, help="number of nodes of the random search")
+    parser.add_argument("--replay", action="store_true", help="also replay the events on a sequence variable")
+    args = parser.parse_args()
+    if args.random:
+        with TraceWriter(args.paths[0], args.nodes) as writer:
+            random_search(writer, args.nodes, args.random)
+    for path in args.paths:
+        start = time.perf_counter()
+        counts = np.zeros(len(kinds), dtype=int)
+        for chunk in chunks(path):
+            counts += np.bincount(chunk["kind"], minlength=len(kinds))[:len(kinds)]
+        summary = ", ".join(f"{count} {kind}" for kind, count in zip(kinds, counts) if count)
+        print(f"{path}: {read_header(path).n} nodes, {counts.sum()} events ({summary}), "
+              f"{os.path.getsize(path) / 1e6:.1f}MB, read in {time.perf_counter() - start:.2f}s")
+        if args.replay:
+            start = time.perf_counter()
+            sequence = None
+            for _, sequence, _ in replay(path):
+                pass
+            print(f"replayed in {time.perf_counter() - start:.2f}s, final state {sequence}")
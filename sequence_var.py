@@ -0,0 +1,252 @@
+# sequence variable over n nodes, as presented in the slides Sequences and DomainConsistency
+"""
+the domain of the variable is represented as in the paper, with arrays only:
+- the tri-partition of the nodes into members (S), possible (P) and excluded (E) nodes is one sparse set:
+  a permutation of the nodes, S first, then P, then E, along with the position of every node in it
+- the partial sequence is given by the successor and predecessor of every member, from the first node (alpha)
+  to the last one (omega), the successor of omega being alpha
+- the insertions I^x of each node are a sparse set over the nodes: row x of an n x n permutation, with the
+  position of every node in the row and the size of the set
+- n_s^x = |I^x & S| and n_p^x = |I^x & P| are maintained by every operation
+the operations have the complexities of the table of DomainConsistency, the work linear in |P| being done with numpy:
+
+operation                     complexity
+is_bound                      1
+is_member/possible/excluded   1
+get_members/possible/excluded |S|, |P|, |E|
+get_states                    n
+succ, pred                    1
+insert                        |P|
+exclude                       |P|
+n_member_inserts              1
+n_possible_inserts            1
+get_member_inserts            min(|I^x|, |S|)
+get_possible_inserts          min(|I^x|, |P|)
+can_insert                    1
+remove_insert                 O(|P|)
+keep_inserts                  O(|I^x| + |P|)
+save_state                    1
+restore_state                 number of writes since the save
+
+a possible node without insertion left is excluded, as required by the consistency of the domain
+the state can be saved and restored in O(1) and O(changes) by the trail of trail.py: only the sizes of the sparse
+sets, the successors and predecessors and the counters are trailed
+the operations can be recorded by a sequence_trace.TraceWriter given as trace, to be replayed later
+"""
+import numpy as np
+
+from trail import Trail
+
+
+class SequenceVar:
+
+    def __init__(self, n, first=0, last=None, trace=None):
+        self.n = n
+        self.trail = Trail()
+        self.trace = trace
+        self.first = first
+        self.last = n - 1 if last is None else last
+        # tri-partition: nodes[:n_members] are S, nodes[n_members:n_members + n_possible] are P, the rest E
+        self.nodes = np.arange(n)
+        self.position = np.arange(n)
+        self.n_members = 0
+        self.n_possible = n
+        self.succ_array = np.arange(n)
+        self.pred_array = np.arange(n)
+        for node in (self.first, self.last):
+            self._move(node, self.n_members)
+            self.n_members += 1
+            self.n_possible -= 1
+        self.succ_array[[self.first, self.last]] = self.last, self.first
+        self.pred_array[[self.first, self.last]] = self.last, self.first
+        # every possible node can be inserted after any node but itself and omega, which are kept after the others
+        invalid = np.eye(n, dtype=bool)
+        invalid[:, self.last] = True
+        self.inserts = np.argsort(invalid, axis=1, kind="stable").astype(np.int32)
+        self.inserts_position = np.argsort(self.inserts, axis=1).astype(np.int32)
+        possible = self.get_possible()
+        self.inserts_size = np.zeros(n, dtype=np.int32)
+        self.inserts_size[possible] = n - 2
+        self.n_member_inserts_array = np.zeros(n, dtype=np.int32)
+        self.n_member_inserts_array[possible] = 1
+        self.n_possible_inserts_array = np.zeros(n, dtype=np.int32)
+        self.n_possible_inserts_array[possible] = n - 3
+
+    def _move(self, node, index):
+        # swap node with the node at index in the tri-partition
+        other = self.nodes[index]
+        current = self.position[node]
+        self.nodes[index], self.nodes[current] = node, other
+        self.position[node], self.position[other] = index, current
+
+    def _remove_from_inserts(self, rows, node):
+        # remove node from the insertions of the nodes in rows, which all contain it
+        last = self.inserts_size[rows] - 1
+        position = self.inserts_position[rows, node]
+        other = self.inserts[rows, last]
+        self.inserts[rows, position] = other
+        self.inserts_position[rows, other] = position
+        self.inserts[rows, last] = node
+        self.inserts_position[rows, node] = last
+        self.trail.write(self.inserts_size, rows, last)
+
+    def _add(self, array, index, value):
+        self.trail.write(array, index, array[index] + value)
+
+    def _set_size(self, name, value):
+        self.trail.write(vars(self), name, value)
+
+    def is_bound(self):
+        return self.n_possible == 0
+
+    def is_member(self, node):
+        return bool(self.position[node] < self.n_members)
+
+    def is_possible(self, node):
+        return bool(self.n_members <= self.position[node] < self.n_members + self.n_possible)
+
+    def is_excluded(self, node):
+        return bool(self.position[node] >= self.n_members + self.n_possible)
+
+    def get_members(self):
+        # members in the order of the sequence, from alpha to omega
+        members = [self.first]
+        while members[-1] != self.last:
+            members.append(int(self.succ_array[members[-1]]))
+        return members
+
+    def get_possible(self):
+        return self.nodes[self.n_members:self.n_members + self.n_possible].copy()
+
+    def get_excluded(self):
+        return self.nodes[self.n_members + self.n_possible:].copy()
+
+    def get_states(self):
+        # state of every node: 0 for the members, 1 for the possible nodes and 2 for the excluded ones
+        return np.searchsorted([self.n_members, self.n_members + self.n_possible], self.position, side="right")
+
+    def succ(self, node):
+        return int(self.succ_array[node])
+
+    def pred(self, node):
+        return int(self.pred_array[node])
+
+    def n_member_inserts(self, node):
+        return int(self.n_member_inserts_array[node])
+
+    def n_possible_inserts(self, node):
+        return int(self.n_possible_inserts_array[node])
+
+    def get_inserts(self, node):
+        return self.inserts[node, :self.inserts_size[node]].copy()
+
+    def get_member_inserts(self, node):
+        # enumerates the smallest of I^x and S
+        if self.inserts_size[node] <= self.n_members:
+            inserts = self.get_inserts(node)
+            return inserts[self.position[inserts] < self.n_members]
+        members = self.nodes[:self.n_members]
+        return members[self.inserts_position[node, members] < self.inserts_size[node]]
+
+    def get_possible_inserts(self, node):
+        # enumerates the smallest of I^x and P
+        if self.inserts_size[node] <= self.n_possible:
+            inserts = self.get_inserts(node)
+            return inserts[(self.position[inserts] >= self.n_members)
+                           & (self.position[inserts] < self.n_members + self.n_possible)]
+        possible = self.get_possible()
+        return possible[self.inserts_position[node, possible] < self.inserts_size[node]]
+
+    def get_insert_matrix(self):
+        # n x n booleans, row x telling which nodes are in I^x
+        return self.inserts_position < self.inserts_size[:, None]
+
+    def can_insert(self, pred, node):
+        return bool(self.inserts_position[node, pred] < self.inserts_size[node])
+
+    def insert(self, pred, node):
+        # insert node after pred in the sequence
+        if not self.is_possible(node) or not self.is_member(pred) or not self.can_insert(pred, node):
+            raise ValueError(f"cannot insert {node} after {pred}")
+        if self.trace is not None:
+            self.trace.insert(pred, node)
+        self._move(node, self.n_members)
+        self._set_size("n_members", self.n_members + 1)
+        self._set_size("n_possible", self.n_possible - 1)
+        succ = self.succ_array[pred]
+        self.trail.write(self.succ_array, [node, pred], [succ, node])
+        self.trail.write(self.pred_array, [node, succ], [pred, node])
+        # a member has no insertion
+        self._clear_inserts(node)
+        # the node becomes a member in the insertions of the possible nodes
+        possible = self.get_possible()
+        possible = possible[self.inserts_position[possible, node] < self.inserts_size[possible]]
+        self._add(self.n_member_inserts_array, possible, 1)
+        self._add(self.n_possible_inserts_array, possible, -1)
+
+    def _clear_inserts(self, node):
+        self.trail.write(self.inserts_size, node, 0)
+        self.trail.write(self.n_member_inserts_array, node, 0)
+        self.trail.write(self.n_possible_inserts_array, node, 0)
+
+    def exclude(self, node):
+        if not self.is_possible(node):
+            raise ValueError(f"cannot exclude {node}, which is not possible")
+        if self.trace is not None:
+            self.trace.exclude(node)
+        self._exclude(node)
+
+    def _exclude(self, node):
+        # exclusion of a possible node, along with the nodes left without insertion
+        to_exclude = [node]
+        while to_exclude:
+            node = to_exclude.pop()
+            if not self.is_possible(node):
+                continue
+            self._move(node, self.n_members + self.n_possible - 1)
+            self._set_size("n_possible", self.n_possible - 1)
+            self._clear_inserts(node)
+            # an excluded node is not a predecessor anymore
+            possible = self.get_possible()
+            possible = possible[self.inserts_position[possible, node] < self.inserts_size[possible]]
+            if len(possible):
+                self._remove_from_inserts(possible, node)
+                self._add(self.n_possible_inserts_array, possible, -1)
+                to_exclude += possible[self.inserts_size[possible] == 0].tolist()
+
+    def remove_insert(self, pred, node):
+        # remove pred from I^node, excluding node if it has no insertion left
+        if not self.can_insert(pred, node):
+            return
+        if self.trace is not None:
+            self.trace.remove_insert(pred, node)
+        self._remove_from_inserts(np.array([node]), pred)
+        if self.is_member(pred):
+            self._add(self.n_member_inserts_array, node, -1)
+        else:
+            self._add(self.n_possible_inserts_array, node, -1)
+        if self.inserts_size[node] == 0:
+            self._exclude(node)
+
+    def keep_inserts(self, node, preds):
+        # remove from I^node every predecessor not in preds
+        for pred in np.setdiff1d(self.get_inserts(node), preds):
+            self.remove_insert(pred, node)
+
+    def save_state(self):
+        if self.trace is not None:
+            self.trace.checkpoint()
+        self.trail.save_state()
+
+    def restore_state(self):
+        if self.trace is not None:
+            self.trace.backtrack()
+        self.trail.restore_state()
+
+    def get_insert_pairs(self):
+        # (pred, node) for every insertion of every possible node
+        return {(int(pred), int(node)) for node in self.get_possible() for pred in self.get_inserts(node)}
+
+    def __str__(self):
+        members = " -> ".join(map(str, self.get_members()))
+        return f"{members} P={self.get_possible().tolist()} E={self.get_excluded().tolist()}"
@@ -0,0 +1,91 @@
+# typeset many Tex strings sharing one template in a single LaTeX run
+"""
+the strings are the pages of one document, using the multi-page mode of the standalone class: each page is cropped
+as if the string was compiled alone
+one latex and one dvisvgm processes are started for the whole batch, the pages being split back into the svg files
+that manim expects for each string
+a batch whose template is not based on the standalone class, or which fails to compile, is compiled one string
+at a time, such that an error is attributed to its string
+"""
+import hashlib
+import os
+import re
+import subprocess
+from pathlib import Path
+
+from manim import config
+from manim.utils import tex_file_writing
+
+documentclass_pattern = re.compile(r"\\documentclass(\[(?P<options>[^\]]*)\])?\{standalone\}")
+
+
+def _texcode(expression, environment, tex_template):
+    # code of the document compiled by manim for a string
+    if environment is not None:
+        return tex_template.get_texcode_for_expression_in_env(expression, environment)
+    return tex_template.get_texcode_for_expression(expression)
+
+
+def _split(texcode):
+    # preamble (up to \begin{document}) and body of a document
+    preamble, body = texcode.split("\\begin{document}", 1)
+    return preamble, body.rsplit("\\end{document}", 1)[0]
+
+
+def batch_key(job):
+    # jobs with the same key can be compiled together
+    expression, environment, tex_template = job
+    preamble, _ = _split(_texcode(expression, environment, tex_template))
+    return preamble, tex_template.tex_compiler, tex_template.output_format
+
+
+def batch_document(jobs):
+    # source of a document with one page per job, None if the template is not based on standalone
+    preamble, _ = _split(_texcode(*jobs[0]))
+    match = documentclass_pattern.search(preamble)
+    if match is None:
+        return None
+    options = [o for o in (match.group("options") or "").split(",") if o.strip()] + ["multi"]
+    preamble = preamble[:match.start()] + f"\\documentclass[{','.join(options)}]{{standalone}}" + preamble[match.end():]
+    pages = [f"\\begin{{standalone}}{_split(_texcode(*job))[1]}\\end{{standalone}}\n" for job in jobs]
+    return f"{preamble}\\begin{{document}}\n{''.join(pages)}\\end{{document}}\n"
+
+
+def _compile_alone(jobs):
+    errors = []
+    for expression, environment, tex_template in jobs:
+        try:
+            tex_file_writing.tex_to_svg_file(expression, environment, tex_template)
+        except Exception as exception:
+            errors.append(f"{expression!r}: {exception}")
+    return errors
+
+
+def compile_batch(jobs):
+    # compile jobs sharing the same batch_key, return the errors
+    document = batch_document(jobs) if len(jobs) > 1 else None
+    if document is None:
+        return _compile_alone(jobs)
+    tex_template = jobs[0][2]
+    tex_dir = config.get_dir("tex_dir")
+    os.makedirs(tex_dir, exist_ok=True)
+    tex_file = Path(tex_dir) / f"batch_{hashlib.sha256(document.encode()).hexdigest()[:16]}.tex"
+    tex_file.write_text(document)
+    try:
+        dvi_file = tex_file_writing.compile_tex(tex_file, tex_template.tex_compiler, tex_template.output_format)
+    except Exception:
+        # one string does not compile: find which one
+        return _compile_alone(jobs)
+    command = ["dvisvgm", "-n", "-v", "0", "-p", "1-", "-o", str(tex_file.with_suffix("")) + "-%p.svg", str(dvi_file)]
+    if tex_template.output_format == ".pdf":
+        command.insert(1, "--pdf")
+    subprocess.run(command, check=False, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    # the page numbers may be padded with zeros
+    pages = sorted(tex_file.parent.glob(f"{tex_file.stem}-*.svg"), key=lambda page: int(page.stem.rsplit("-", 1)[1]))
+    if len(pages) != len(jobs):
+        return _compile_alone(jobs)
+    for job, page in zip(jobs, pages):
+        # the svg is named as if the string had been compiled alone
+        svg = Path(tex_file_writing.generate_tex_file(*job)).with_suffix(".svg")
+        os.replace(page, svg)
+    return []
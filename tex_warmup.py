@@ -0,0 +1,130 @@
+# compile all the Tex strings of the slides concurrently before rendering them
+"""
+the Tex strings are collected by executing the slides with the null renderer of dry_run.py:
+every string whose svg is missing from the Tex folder of manim is recorded with its environment and its TexTemplate
+(including the custom templates such as the algorithm2e one of Search) and replaced by a placeholder svg
+the missing strings are then compiled by a pool of processes, in batches of strings sharing the same template typeset
+in one LaTeX run (see tex_batch.py), and the slides executed again, until the strings built from the compiled ones
+(MathTex split in parts, ...) are all compiled
+the rendering then only hits a warm cache
+"""
+import argparse
+import importlib
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+
+from manim import config
+from manim.utils import tex_file_writing
+
+import utils
+from dry_run import dry_run, load_slides
+from merge_slide import select_slides, slide_names, to_merge
+from tex_batch import batch_key, compile_batch
+
+# modules calling tex_to_svg_file, depending on the version of manim
+tex_modules = ["manim.mobject.text.tex_mobject", "manim.mobject.svg.tex_mobject", "manim.utils.tex_file_writing"]
+max_passes = 5
+placeholder = """<svg xmlns="http://www.w3.org/2000/svg" width="10pt" height="10pt" viewBox="0 0 10 10">
+<path d="M 0 0 L 10 0 L 10 10 L 0 10 Z"/>
+</svg>
+"""
+
+
+def svg_file(expression, environment=None, tex_template=None):
+    # path of the svg written by manim for a Tex string
+    tex_template = tex_template or config.tex_template
+    return Path(tex_file_writing.generate_tex_file(expression, environment, tex_template)).with_suffix(".svg")
+
+
+@contextmanager
+def collecting(jobs):
+    # Tex strings without svg are added to jobs and replaced by a placeholder
+    placeholder_file = os.path.join(config.get_dir("tex_dir"), "placeholder.svg")
+    os.makedirs(os.path.dirname(placeholder_file), exist_ok=True)
+    with open(placeholder_file, "w") as file:
+        file.write(placeholder)
+
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        svg = svg_file(expression, environment, tex_template)
+        if svg.exists():
+            return svg
+        jobs.setdefault(str(svg), (expression, environment, tex_template or config.tex_template))
+        return placeholder_file
+
+    modules = [importlib.import_module(name) for name in tex_modules]
+    originals = [(module, module.tex_to_svg_file) for module in modules if hasattr(module, "tex_to_svg_file")]
+    for module, _ in originals:
+        module.tex_to_svg_file = tex_to_svg_file
+    try:
+        yield jobs
+    finally:
+        for module, function in originals:
+            module.tex_to_svg_file = function
+
+
+def _init_worker(media_dir):
+    # the Tex folder is shared between the processes: nothing must be deleted while compiling
+    config.media_dir = media_dir
+    config.no_latex_cleanup = True
+
+
+def batches(jobs, workers):
+    # jobs grouped by template, each group being split such that every worker gets a batch
+    groups = {}
+    for job in jobs:
+        groups.setdefault(batch_key(job), []).append(job)
+    size = max(1, -(-len(jobs) // workers))
+    return [group[i:i + size] for group in groups.values() for i in range(0, len(group), size)]
+
+
+def compile_jobs(jobs, workers=None):
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(config.media_dir,)) as pool:
+        return [error for errors in pool.map(compile_batch, batches(jobs, workers)) for error in errors]
+
+
+def warmup(file_name=to_merge, spec=None, workers=None):
+    # compile the Tex strings of the slides, return the errors
+    names = slide_names(file_name)
+    if spec is not None:
+        names = select_slides(names, spec)
+    progress_bar = config.progress_bar
+    config.progress_bar = "none"
+    module = load_slides(file_name)
+    failed = set()
+    errors = []
+    try:
+        for _ in range(max_passes):
+            # the Tex cached on a placeholder would be copied instead of built from the compiled svg
+            utils._tex_cache.clear()
+            jobs = {}
+            with collecting(jobs):
+                for name in names:
+                    # the slides may fail on placeholders, the next pass goes further
+                    dry_run(getattr(module, name))
+            jobs = [job for svg, job in jobs.items() if svg not in failed]
+            if not jobs:
+                break
+            print(f"compiling {len(jobs)} Tex strings")
+            new_errors = compile_jobs(jobs, workers)
+            failed.update(str(svg_file(*job)) for job in jobs if not svg_file(*job).exists())
+            errors += new_errors
+    finally:
+        config.progress_bar = progress_bar
+    return errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=f"compile the Tex strings of the slides from {to_merge}")
+    parser.add_argument("slides", nargs="?", default=None,
+                        help="slides whose strings are compiled, such as Sequences..TransitionTime (all by default)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="number of strings compiled at once")
+    args = parser.parse_args()
+    errors = warmup(spec=args.slides, workers=args.jobs)
+    for error in errors:
+        print(error, file=sys.stderr)
+    if errors:
+        sys.exit(1)
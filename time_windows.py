@@ -0,0 +1,38 @@
+# propagation of the time windows along a sequence of nodes
+"""
+the windows are an array of (earliest, latest) times for each node, the travel times a matrix between the nodes
+with c the time to travel from the first node of the sequence to each of its nodes:
+- forward: earliest[k] = max(earliest[k], earliest[k - 1] + travel), i.e. c + maximum.accumulate(earliest - c)
+- backward: latest[k] = min(latest[k], latest[k + 1] - travel), i.e. c + reversed minimum.accumulate(latest - c)
+both passes are computed with numpy, in time linear in the length of the sequence
+"""
+import numpy as np
+
+
+def arrival_times(sequence, transitions):
+    # time to travel from the first node of the sequence to each of its nodes
+    sequence = np.asarray(sequence)
+    return np.concatenate([[0], np.cumsum(np.asarray(transitions)[sequence[:-1], sequence[1:]])])
+
+
+def forward(windows, sequence, transitions):
+    # copy of the windows, the earliest times of the nodes in the sequence being tightened
+    windows = np.array(windows)
+    sequence = np.asarray(sequence)
+    c = arrival_times(sequence, transitions)
+    windows[sequence, 0] = c + np.maximum.accumulate(windows[sequence, 0] - c)
+    return windows
+
+
+def backward(windows, sequence, transitions):
+    # copy of the windows, the latest times of the nodes in the sequence being tightened
+    windows = np.array(windows)
+    sequence = np.asarray(sequence)
+    c = arrival_times(sequence, transitions)
+    windows[sequence, 1] = c + np.minimum.accumulate((windows[sequence, 1] - c)[::-1])[::-1]
+    return windows
+
+
+def propagate(windows, sequence, transitions):
+    return backward(forward(windows, sequence, transitions), sequence, transitions)
+
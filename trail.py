@@ -0,0 +1,42 @@
+# trail of the reversible state of the sequence variable
+"""
+every write into the reversible state (an entry of a numpy array or an attribute) goes through the trail, which
+records the previous value when a state has been saved
+save_state() only marks the current length of the trail, in O(1), and restore_state() undoes the writes done since
+the last mark, in time linear in their number instead of copying the whole state
+the sparse sets need no more than their size to be trailed: their elements are only swapped within the set, such
+that restoring the size restores the content of the set
+"""
+
+
+class Trail:
+
+    def __init__(self):
+        self.entries = []
+        self.levels = []
+
+    def write(self, target, key, value):
+        """
+        target[key] = value, target being a numpy array (indexed by integers, not by slices) or the vars() of an
+        object whose attribute key is reversible
+        """
+        if self.levels:
+            self.entries.append((target, key, target[key]))
+        target[key] = value
+
+    def save_state(self):
+        self.levels.append(len(self.entries))
+
+    def restore_state(self):
+        # undo the writes since the last saved state, the last write first
+        level = self.levels.pop()
+        while len(self.entries) > level:
+            target, key, value = self.entries.pop()
+            target[key] = value
+
+    def changes(self):
+        # number of writes which would be undone by restore_state
+        return len(self.entries) - self.levels[-1] if self.levels else 0
+
+    def depth(self):
+        return len(self.levels)
@@ -7,3 +7,31 @@ MEMBER = GREEN
 POSSIBLE = BLUE
 EXCLUDED = RED
 
+
+# Tex built once for each set of arguments, the other ones being copies
+_tex_cache = {}
+
+
+def _hashable(value):
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return repr(value)
+
+
+def _cached(cls, strings, scale, kwargs):
+    key = (cls, strings, scale, tuple((k, _hashable(v)) for k, v in sorted(kwargs.items())))
+    if key not in _tex_cache:
+        _tex_cache[key] = cls(*strings, **kwargs).scale(scale)
+    return _tex_cache[key].copy()
+
+
+def cached_tex(*strings, scale=1, **kwargs):
+    # same as Tex(*strings, **kwargs).scale(scale), the svg being parsed only once
+    return _cached(Tex, strings, scale, kwargs)
+
+
+def cached_math_tex(*strings, scale=1, **kwargs):
+    # same as MathTex(*strings, **kwargs).scale(scale), the svg being parsed only once
+    return _cached(MathTex, strings, scale, kwargs)